@@ -0,0 +1,72 @@
+"""Нагрузочный тест CatalogService: N параллельных клиентов, задержки p50/p99.
+
+Запуск: python -m benchmarks.load_test_service --clients 50 --requests 200
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import List
+
+from src.moduls import Category, Product, set_creation_hook
+from src.service import CatalogService
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+async def client(host: str, port: int, requests: int, index: int, latencies: List[float]) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for i in range(requests):
+            if i % 2:
+                body = json.dumps({"category": "Нагрузка", "product": f"Товар {(index + i) % 100}", "quantity": 1})
+                request = (
+                    f"POST /orders HTTP/1.1\r\nHost: {host}\r\nContent-Length: {len(body.encode())}\r\n\r\n{body}"
+                )
+            else:
+                request = f"GET /categories HTTP/1.1\r\nHost: {host}\r\n\r\n"
+            started = time.perf_counter()
+            writer.write(request.encode("utf-8"))
+            await writer.drain()
+            length = 0
+            await reader.readline()
+            while True:
+                line = await reader.readline()
+                if line == b"\r\n":
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+    finally:
+        writer.close()
+
+
+async def run(clients: int, requests: int) -> None:
+    set_creation_hook(None)
+    products = Product.from_records((f"Товар {i}", "Описание", 100.0, 10**9) for i in range(100))
+    service = CatalogService([Category("Нагрузка", "Синтетическая категория", products)])
+    host, port = await service.start()
+    latencies: List[float] = []
+    started = time.perf_counter()
+    await asyncio.gather(*(client(host, port, requests, n, latencies) for n in range(clients)))
+    elapsed = time.perf_counter() - started
+    await service.stop()
+    print(f"запросов: {len(latencies)}, {len(latencies) / elapsed:.0f} запросов/с")
+    print(f"p50: {percentile(latencies, 50) * 1000:.2f} мс, p99: {percentile(latencies, 99) * 1000:.2f} мс")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.clients, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Время запуска команд catalog и разбор -X importtime.
+
+Примеры:
+    python -m benchmarks.startup catalog.snap
+    python -m benchmarks.startup catalog.snap --budget-ms 80
+
+Скрипт измеряет лучшее из --repeats время запуска команды stats над каталогом, выводит самые дорогие импорты
+и завершается с кодом 1, если время превышает --budget-ms. Байт-код модулей должен быть скомпилирован заранее
+(python -m compileall src), иначе при PYTHONDONTWRITEBYTECODE каждый запуск тратит время на компиляцию.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Sequence, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def command(catalog: str, *options: str) -> List[str]:
+    return [sys.executable, *options, "-m", "src.cli", "stats", catalog]
+
+
+def wall_time(args: Sequence[str], repeats: int) -> float:
+    """Лучшее время запуска процесса, мс"""
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        subprocess.run(args, cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int]]:
+    """Модуль -> (собственное, накопленное время импорта в мкс) из вывода -X importtime"""
+    modules: Dict[str, Tuple[int, int]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, cumulative, name = line[len("import time:") :].split("|")
+        if own.strip().isdigit():
+            modules[name.strip()] = (int(own), int(cumulative))
+    return modules
+
+
+def imported_modules(catalog: str) -> Dict[str, Tuple[int, int]]:
+    result = subprocess.run(
+        command(catalog, "-X", "importtime"), cwd=ROOT, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    return parse_importtime(result.stderr.decode("utf-8", "replace"))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("catalog", help="каталог (снимок или JSON)")
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--top", type=int, default=10, help="сколько самых дорогих импортов показать")
+    parser.add_argument("--budget-ms", type=float, help="допустимое время запуска, мс")
+    args = parser.parse_args()
+
+    interpreter = wall_time([sys.executable, "-c", "pass"], args.repeats)
+    startup = wall_time(command(args.catalog), args.repeats)
+    print(f"интерпретатор: {interpreter:.1f} мс, catalog stats: {startup:.1f} мс")
+    modules = imported_modules(args.catalog)
+    print(f"импортировано модулей: {len(modules)}")
+    for name, (own, _) in sorted(modules.items(), key=lambda item: -item[1][0])[: args.top]:
+        print(f"{own / 1000:>8.1f} мс  {name}")
+    if args.budget_ms is not None and startup > args.budget_ms:
+        print(f"ПРЕВЫШЕН БЮДЖЕТ {startup:.1f} мс > {args.budget_ms:.1f} мс")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+"""Набор бенчмарков горячих путей каталога на синтетических данных.
+
+Примеры:
+    python -m benchmarks.suite --sizes 1000,100000 --save benchmarks/baseline.json
+    python -m benchmarks.suite --sizes 1000,100000 --compare benchmarks/baseline.json --threshold 0.2
+
+С --compare скрипт завершается с кодом 1, если пропускная способность упала или пиковая память выросла
+больше чем на threshold относительно базовой линии.
+"""
+
+import argparse
+import atexit
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from src import codec
+from src.delta import apply_delta
+from src.data_loader import load_catalog, load_categories_from_json
+from src.moduls import Category, CategoryIterator, Order, Product, set_creation_hook
+from src.registry import use_registry
+
+# кейс: по размеру каталога готовит состояние (не измеряется) и возвращает операцию и число элементов в ней
+Case = Callable[[int], Tuple[Callable[[], Any], int]]
+CALLS = 1000
+
+
+def make_products(size: int) -> List[Product]:
+    return Product.from_records((f"Товар {i}", "Описание товара", 100.0 + i % 997, 1 + i % 50) for i in range(size))
+
+
+def write_catalog(size: int) -> str:
+    """Временный JSON-каталог из size товаров (по 10 000 в категории); удаляется при выходе.
+
+    Категории пишутся в файл по одной, поэтому в памяти не бывает больше одной категории даже для 10 млн товаров.
+    """
+    handle, path = tempfile.mkstemp(suffix=".json")
+    atexit.register(os.remove, path)
+    per_category = max(1, min(size, 10000))
+    with os.fdopen(handle, "w", encoding="utf-8") as file:
+        file.write("[")
+        for start in range(0, size, per_category):
+            category = {
+                "name": f"Категория {start}",
+                "description": "Описание",
+                "products": [
+                    {"name": f"Товар {i}", "description": "Описание", "price": 100.0 + i, "quantity": 1 + i % 50}
+                    for i in range(start, min(size, start + per_category))
+                ],
+            }
+            file.write(("," if start else "") + json.dumps(category, ensure_ascii=False))
+        file.write("]")
+    return path
+
+
+def case_load_json(size: int) -> Tuple[Callable[[], Any], int]:
+    path = write_catalog(size)
+    return (lambda: load_categories_from_json(path)), size
+
+
+def case_load_catalog(size: int) -> Tuple[Callable[[], Any], int]:
+    """Загрузка с проверкой схемы (load_catalog) на том же каталоге, что и load_json"""
+    path = write_catalog(size)
+    return (lambda: load_catalog(path)), size
+
+
+def case_category_init(size: int) -> Tuple[Callable[[], Any], int]:
+    products = make_products(size)
+    return (lambda: Category("Категория", "Описание", products)), size
+
+
+def case_middle_price(size: int) -> Tuple[Callable[[], Any], int]:
+    category = Category("Категория", "Описание", make_products(size))
+    return (lambda: [category.middle_price() for _ in range(CALLS)]), CALLS
+
+
+def case_category_str(size: int) -> Tuple[Callable[[], Any], int]:
+    category = Category("Категория", "Описание", make_products(size))
+    return (lambda: [str(category) for _ in range(CALLS)]), CALLS
+
+
+def case_products_str(size: int) -> Tuple[Callable[[], Any], int]:
+    category = Category("Категория", "Описание", make_products(size))
+    products = category.products
+
+    def run() -> str:
+        products[0].quantity += 1  # изменение сбрасывает кеш, измеряется полный рендер
+        return category.products_str()
+
+    return run, size
+
+
+def case_iterator(size: int) -> Tuple[Callable[[], Any], int]:
+    category = Category("Категория", "Описание", make_products(size))
+    return (lambda: sum(1 for _ in CategoryIterator(category))), size
+
+
+def case_product_add(size: int) -> Tuple[Callable[[], Any], int]:
+    products = make_products(size + 1)
+    return (lambda: [products[i] + products[i + 1] for i in range(size)]), size
+
+
+def case_order(size: int) -> Tuple[Callable[[], Any], int]:
+    products = make_products(size)
+    return (lambda: [Order(product, 1) for product in products]), size
+
+
+def case_delta(size: int) -> Tuple[Callable[[], Any], int]:
+    """Дельта, удаляющая 1% товаров категории и вставляющая их обратно: цена операции не должна расти с size"""
+    category = Category("Категория", "Описание", make_products(size))
+    names = [f"Товар {i}" for i in range(0, size, 100)]
+    lines = [json.dumps({"op": "delete", "category": "Категория", "name": name}) for name in names]
+    lines += [
+        json.dumps(
+            {
+                "op": "upsert",
+                "category": "Категория",
+                "product": {"name": name, "description": "Описание товара", "price": 100.0, "quantity": 1},
+            }
+        )
+        for name in names
+    ]
+    return (lambda: apply_delta([category], lines)), len(lines)
+
+
+def case_encode(backend: str) -> Case:
+    def case(size: int) -> Tuple[Callable[[], Any], int]:
+        categories = [Category("Категория", "Описание", make_products(size))]
+        return (lambda: sum(map(len, codec.iter_encode(categories, codec.get_backend(backend))))), size
+
+    return case
+
+
+def case_decode(backend: str) -> Case:
+    def case(size: int) -> Tuple[Callable[[], Any], int]:
+        data = codec.dumps([Category("Категория", "Описание", make_products(size))])
+        return (lambda: codec.loads(data, codec.get_backend(backend))), size
+
+    return case
+
+
+CASES: Dict[str, Case] = {
+    "load_json": case_load_json,
+    "load_catalog": case_load_catalog,
+    "category_init": case_category_init,
+    "middle_price": case_middle_price,
+    "category_str": case_category_str,
+    "products_str": case_products_str,
+    "category_iterator": case_iterator,
+    "product_add": case_product_add,
+    "order_create": case_order,
+    "delta": case_delta,
+}
+for _backend in codec.BACKENDS:
+    CASES[f"encode_{_backend}"] = case_encode(_backend)
+    CASES[f"decode_{_backend}"] = case_decode(_backend)
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def run_case(case: Case, size: int, repeats: int) -> Dict[str, float]:
+    """Пропускная способность (элементов/с), медианное и худшее время прогона (мс) и пиковая память (МБ).
+
+    Время измеряется для прогона операции целиком, поэтому по --repeats прогонам выводятся медиана и максимум,
+    а не процентили отдельных операций.
+    """
+    with use_registry():
+        operation, items = case(size)
+        tracemalloc.start()
+        operation()  # прогрев и замер памяти в одном прогоне
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        durations = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            operation()
+            durations.append(time.perf_counter() - started)
+    return {
+        "throughput": items / percentile(durations, 50),
+        "p50_ms": percentile(durations, 50) * 1000,
+        "max_ms": max(durations) * 1000,
+        "peak_mb": peak / 2**20,
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float
+) -> List[str]:
+    """Список регрессий относительно базовой линии"""
+    regressions = []
+    for key, current in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if current["throughput"] < base["throughput"] * (1 - threshold):
+            regressions.append(f"{key}: пропускная способность {current['throughput']:.0f} < {base['throughput']:.0f}")
+        if current["peak_mb"] > base["peak_mb"] * (1 + threshold) and current["peak_mb"] - base["peak_mb"] > 1:
+            regressions.append(f"{key}: пиковая память {current['peak_mb']:.1f} МБ > {base['peak_mb']:.1f} МБ")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000", help="размеры каталога через запятую (до 10000000)")
+    parser.add_argument("--cases", default=",".join(CASES), help="кейсы через запятую")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--save", help="сохранить результаты как базовую линию в JSON")
+    parser.add_argument("--compare", help="сравнить с базовой линией из JSON")
+    parser.add_argument("--threshold", type=float, default=0.2, help="допустимое ухудшение (доля)")
+    args = parser.parse_args()
+
+    set_creation_hook(None)
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"{'кейс':<26}{'элементов/с':>14}{'p50, мс':>11}{'max, мс':>11}{'пик, МБ':>10}")
+    for size in (int(value) for value in args.sizes.split(",")):
+        for name in args.cases.split(","):
+            key = f"{name}@{size}"
+            results[key] = row = run_case(CASES[name], size, args.repeats)
+            print(
+                f"{key:<26}{row['throughput']:>14,.0f}{row['p50_ms']:>11.2f}"
+                f"{row['max_ms']:>11.2f}{row['peak_mb']:>10.1f}"
+            )
+
+    if args.save:
+        meta = {"python": sys.version.split()[0], "platform": platform.platform()}
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump({"meta": meta, "results": results}, file, ensure_ascii=False, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = compare(results, json.load(file)["results"], args.threshold)
+        for line in regressions:
+            print(f"РЕГРЕССИЯ {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Sequence, Tuple, Union
+
+if TYPE_CHECKING:
+    from src.moduls import Category, Product
+
+# numpy импортируется при первом пакетном вычислении, а не при импорте каталога: импорт numpy заметно
+# удлиняет запуск коротких команд (см. src.cli)
+HAS_NUMPY = find_spec("numpy") is not None
+
+
+def _numpy() -> Any:
+    import numpy
+
+    return numpy
+
+
+ProductSource = Union["Category", Iterable["Product"]]
+
+
+def _products(source: ProductSource) -> List["Product"]:
+    # у категории берётся список продуктов, любой другой источник считается итерируемым
+    products: Any = getattr(source, "products", source)
+    return products if isinstance(products, list) else list(products)
+
+
+def to_arrays(source: ProductSource, use_numpy: bool = HAS_NUMPY) -> Dict[str, Any]:
+    """Колонки price, quantity и kind (имя класса продукта): массивы NumPy или списки без него"""
+    products = _products(source)
+    prices = [p.price for p in products]
+    quantities = [p.quantity for p in products]
+    kinds = [type(p).__name__ for p in products]
+    if use_numpy:
+        np = _numpy()
+        return {
+            "price": np.asarray(prices, dtype=np.float64),
+            "quantity": np.asarray(quantities, dtype=np.int64),
+            "kind": np.asarray(kinds),
+        }
+    return {"price": prices, "quantity": quantities, "kind": kinds}
+
+
+def totals(source: ProductSource, use_numpy: bool = HAS_NUMPY) -> Dict[str, float]:
+    """Количество продуктов, суммы цен и остатков, общая стоимость остатков и средняя цена"""
+    arrays = to_arrays(source, use_numpy)
+    prices, quantities = arrays["price"], arrays["quantity"]
+    count = len(prices)
+    if use_numpy:
+        total_price = float(prices.sum())
+        total_quantity = int(quantities.sum())
+        stock_value = float(prices @ quantities)
+    else:
+        total_price = sum(prices)
+        total_quantity = sum(quantities)
+        stock_value = sum(p * q for p, q in zip(prices, quantities))
+    return {
+        "count": count,
+        "total_price": total_price,
+        "total_quantity": total_quantity,
+        "stock_value": stock_value,
+        "mean_price": total_price / count if count else 0.0,
+    }
+
+
+def percentiles(source: ProductSource, qs: Sequence[float], use_numpy: bool = HAS_NUMPY) -> List[float]:
+    """Перцентили цен (0–100) с линейной интерполяцией, как numpy.percentile по умолчанию"""
+    prices = to_arrays(source, use_numpy)["price"]
+    if not len(prices):
+        return [0.0 for _ in qs]
+    if use_numpy:
+        return [float(v) for v in _numpy().percentile(prices, qs)]
+    ordered = sorted(prices)
+    result = []
+    for q in qs:
+        position = (len(ordered) - 1) * q / 100
+        lower = int(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        result.append(ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower))
+    return result
+
+
+def group_by_class(source: ProductSource, use_numpy: bool = HAS_NUMPY) -> Dict[str, Dict[str, float]]:
+    """Агрегаты по классам продуктов: количество, сумма остатков, стоимость остатков и средняя цена"""
+    arrays = to_arrays(source, use_numpy)
+    prices, quantities, kinds = arrays["price"], arrays["quantity"], arrays["kind"]
+    groups: Dict[str, Dict[str, float]] = {}
+    if use_numpy:
+        np = _numpy()
+        names, codes = np.unique(kinds, return_inverse=True)
+        counts = np.bincount(codes, minlength=len(names))
+        price_sums = np.bincount(codes, weights=prices, minlength=len(names))
+        quantity_sums = np.bincount(codes, weights=quantities, minlength=len(names))
+        value_sums = np.bincount(codes, weights=prices * quantities, minlength=len(names))
+        for i, name in enumerate(names):
+            groups[str(name)] = {
+                "count": int(counts[i]),
+                "total_quantity": int(quantity_sums[i]),
+                "stock_value": float(value_sums[i]),
+                "mean_price": float(price_sums[i] / counts[i]),
+            }
+        return groups
+    price_totals: Dict[str, float] = {}
+    for price, quantity, kind in zip(prices, quantities, kinds):
+        group = groups.setdefault(kind, {"count": 0, "total_quantity": 0, "stock_value": 0.0, "mean_price": 0.0})
+        group["count"] += 1
+        group["total_quantity"] += quantity
+        group["stock_value"] += price * quantity
+        price_totals[kind] = price_totals.get(kind, 0.0) + price
+    for kind, group in groups.items():
+        group["mean_price"] = price_totals[kind] / group["count"]
+    return dict(sorted(groups.items()))
+
+
+def pair_stock_values(
+    pairs: Iterable[Tuple["Product", "Product"]], use_numpy: bool = HAS_NUMPY
+) -> Union[List[float], Any]:
+    """Пакетный аналог Product.__add__: суммы стоимости остатков для каждой пары продуктов"""
+    pairs = list(pairs)
+    for left, right in pairs:
+        if type(left) is not type(right):
+            raise TypeError("Нельзя складывать товары разных типов")
+    if use_numpy:
+        left_arrays = to_arrays([left for left, _ in pairs], use_numpy)
+        right_arrays = to_arrays([right for _, right in pairs], use_numpy)
+        return left_arrays["price"] * left_arrays["quantity"] + right_arrays["price"] * right_arrays["quantity"]
+    return [left.price * left.quantity + right.price * right.quantity for left, right in pairs]
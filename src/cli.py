@@ -0,0 +1,234 @@
+"""Командная строка каталога.
+
+Примеры:
+    catalog load data/products.json -o catalog.snap
+    catalog stats catalog.snap
+    catalog query catalog.snap --category Смартфоны --max-price 100000
+    catalog order catalog.snap --category Смартфоны --product "Iphone 15" --quantity 2 --ledger orders/ --save
+    catalog export catalog.snap catalog.json
+
+Каталог — JSON-файл или бинарный снимок (см. src.snapshot); снимок открывается через mmap без разбора и
+создания продуктов, поэтому короткие команды над ним укладываются в десятки миллисекунд. Модули каталога
+импортируются внутри команд: запуск тратит время только на то, что нужно выбранной команде.
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from src.moduls import Category
+
+
+class CliError(Exception):
+    """Ошибка команды: сообщение выводится в stderr, код завершения 1"""
+
+
+def is_snapshot(path: str) -> bool:
+    """Файл — бинарный снимок (по магической строке в начале), иначе считается JSON"""
+    from src.snapshot import MAGIC
+
+    try:
+        with open(path, "rb") as file:
+            return file.read(len(MAGIC)) == MAGIC
+    except OSError as error:
+        raise CliError(f"не удалось открыть каталог {path}: {error.strerror}") from None
+
+
+def read_catalog(path: str) -> Tuple[List["Category"], int]:
+    """Категории из снимка или из JSON с проверкой схемы и число пропущенных записей (они выводятся в stderr).
+
+    Товары с нулевым остатком принимаются: так каталог переживает сохранение после продаж (order --save).
+    """
+    if is_snapshot(path):
+        from src.snapshot import load_snapshot
+
+        return load_snapshot(path), 0
+
+    from src.data_loader import load_catalog
+
+    categories, report = load_catalog(os.path.abspath(path), allow_sold_out=True)
+    for error in report.errors:
+        print(
+            f"пропущена запись: категория {error['category']}, товар {error['product']}: {error['error']}",
+            file=sys.stderr,
+        )
+    return categories, report.rejected
+
+
+def open_catalog(path: str) -> List["Category"]:
+    return read_catalog(path)[0]
+
+
+def _find_category(categories: List["Category"], name: str) -> "Category":
+    for category in categories:
+        if category.name == name:
+            return category
+    raise CliError(f"категория {name!r} не найдена")
+
+
+def _save(categories: List["Category"], path: str, snapshot: bool) -> None:
+    """Записывает каталог снимком или JSON через временный файл: отображение старого снимка остаётся корректным"""
+    temporary = f"{path}.tmp"
+    if snapshot:
+        from src.snapshot import write_snapshot
+
+        write_snapshot(categories, temporary)
+    else:
+        from src import codec
+
+        with open(temporary, "wb") as file:
+            codec.dump(categories, file)
+    os.replace(temporary, path)
+
+
+def command_load(args: argparse.Namespace) -> None:
+    categories = open_catalog(args.source)
+    _save(categories, args.output, snapshot=True)
+    print(f"{len(categories)} категорий, {sum(c.quantity for c in categories)} товаров -> {args.output}")
+
+
+def command_stats(args: argparse.Namespace) -> None:
+    rows: List[Dict[str, Any]] = [
+        {
+            "name": category.name,
+            "products": category.quantity,
+            "total_quantity": category.total_quantity,
+            "middle_price": category.middle_price(),
+            "stock_value": category.stock_value,
+        }
+        for category in open_catalog(args.catalog)
+    ]
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+        return
+    width = max((len(row["name"]) for row in rows), default=9) + 2
+    print(f"{'категория':<{width}}{'товаров':>9}{'остаток':>10}{'ср. цена':>14}{'стоимость':>18}")
+    for row in rows:
+        print(
+            f"{row['name']:<{width}}{row['products']:>9}{row['total_quantity']:>10}"
+            f"{row['middle_price']:>14.2f}{row['stock_value']:>18.2f}"
+        )
+
+
+def command_query(args: argparse.Namespace) -> None:
+    attrs = {}
+    for item in args.attr:
+        key, separator, value = item.partition("=")
+        if not separator:
+            raise CliError(f"--attr ожидает ключ=значение, получено {item!r}")
+        attrs[key] = int(value) if value.isdigit() else value
+    categories = open_catalog(args.catalog)
+    if args.category is not None:
+        categories = [_find_category(categories, args.category)]
+    shown = 0
+    for category in categories:
+        try:
+            found = category.query(args.name, args.min_price, args.max_price, **attrs)
+        except (KeyError, TypeError) as error:
+            raise CliError(f"некорректный запрос: {error}") from None
+        for product in found:
+            if args.limit is not None and shown >= args.limit:
+                return
+            print(f"{category.name}: {product}")
+            shown += 1
+
+
+def command_order(args: argparse.Namespace) -> None:
+    from src.orders import OrderEngine
+
+    categories, rejected = read_catalog(args.catalog)
+    if args.save and rejected:
+        # перезапись сохранила бы каталог без пропущенных записей
+        raise CliError(f"в каталоге {rejected} некорректных записей, --save удалил бы их из файла")
+    found = _find_category(categories, args.category).find_by_name(args.product)
+    if not found:
+        raise CliError(f"товар {args.product!r} не найден в категории {args.category!r}")
+
+    ledger = None
+    if args.ledger:
+        from src.ledger import Ledger
+
+        ledger = Ledger(args.ledger)
+    try:
+        order = OrderEngine(ledger=ledger).place_order(found[0], args.quantity)
+    except ValueError as error:
+        raise CliError(str(error)) from None
+    finally:
+        if ledger is not None:
+            ledger.close()
+    if args.save:
+        _save(categories, args.catalog, is_snapshot(args.catalog))
+    print(order)
+
+
+def command_export(args: argparse.Namespace) -> None:
+    from src import codec
+
+    try:
+        backend = codec.get_backend(args.backend)
+    except ValueError as error:
+        raise CliError(str(error)) from None
+    categories = open_catalog(args.catalog)
+    with open(args.output, "wb") as file:
+        written = codec.dump(categories, file, backend)
+    print(f"{written} байт ({backend.name}) -> {args.output}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="catalog", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    load = commands.add_parser("load", help="проверить JSON и сохранить бинарный снимок")
+    load.add_argument("source", help="JSON-файл каталога")
+    load.add_argument("-o", "--output", required=True, help="путь снимка")
+    load.set_defaults(handler=command_load)
+
+    stats = commands.add_parser("stats", help="агрегаты по категориям")
+    stats.add_argument("catalog")
+    stats.add_argument("--json", action="store_true", help="вывод в JSON")
+    stats.set_defaults(handler=command_stats)
+
+    query = commands.add_parser("query", help="поиск товаров")
+    query.add_argument("catalog")
+    query.add_argument("--category")
+    query.add_argument("--name")
+    query.add_argument("--min-price", type=float, default=float("-inf"))
+    query.add_argument("--max-price", type=float, default=float("inf"))
+    query.add_argument("--attr", action="append", default=[], help="атрибут наследника, например memory=512")
+    query.add_argument("--limit", type=int)
+    query.set_defaults(handler=command_query)
+
+    order = commands.add_parser("order", help="оформить заказ")
+    order.add_argument("catalog")
+    order.add_argument("--category", required=True)
+    order.add_argument("--product", required=True)
+    order.add_argument("--quantity", type=int, required=True)
+    order.add_argument("--ledger", help="каталог журнала заказов (src.ledger)")
+    order.add_argument("--save", action="store_true", help="сохранить остатки в файл каталога")
+    order.set_defaults(handler=command_order)
+
+    export = commands.add_parser("export", help="выгрузить каталог в JSON")
+    export.add_argument("catalog")
+    export.add_argument("output")
+    export.add_argument("--backend", help="JSON-бэкенд: orjson, msgspec или json (по умолчанию самый быстрый)")
+    export.set_defaults(handler=command_export)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        args.handler(args)
+    except CliError as error:
+        print(f"catalog: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+import json
+from itertools import islice
+from operator import attrgetter
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type
+
+from src.moduls import Category, Product, build_products
+from src.schema import TYPE_TAGS
+
+# необязательные бэкенды: без пакета имя модуля равно None; msgspec может быть не установлен и при проверке mypy
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgspec  # type: ignore[import-not-found, unused-ignore]
+except ImportError:  # pragma: no cover
+    msgspec = None  # type: ignore[assignment, unused-ignore]
+
+# сколько продуктов кодируется одним вызовом бэкенда при потоковой записи
+CHUNK_SIZE = 1024
+
+# класс продукта -> значение поля "type" (обратное к TYPE_TAGS)
+KIND_TAGS: Dict[Type[Product], str] = {cls: tag for tag, cls in TYPE_TAGS.items()}
+
+
+class Backend:
+    """JSON-бэкенд с единым интерфейсом.
+
+    dumps возвращает UTF-8 байты, loads принимает байты или строку и при ошибке разбора бросает decode_error.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        dumps: Callable[[Any], bytes],
+        loads: Callable[[Any], Any],
+        decode_error: Type[Exception] = json.JSONDecodeError,
+    ) -> None:
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+        self.decode_error = decode_error
+
+    def __repr__(self) -> str:
+        return f"Backend({self.name!r})"
+
+
+def _json_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+BACKENDS: Dict[str, Backend] = {}
+if orjson is not None:
+    BACKENDS["orjson"] = Backend("orjson", orjson.dumps, orjson.loads)
+if msgspec is not None:  # pragma: no cover
+    BACKENDS["msgspec"] = Backend("msgspec", msgspec.json.encode, msgspec.json.decode, msgspec.DecodeError)
+BACKENDS["json"] = Backend("json", _json_dumps, json.loads)
+
+
+def get_backend(name: Optional[str] = None) -> Backend:
+    """Бэкенд по имени; без имени — самый быстрый из установленных (orjson, msgspec, затем stdlib json)"""
+    if name is None:
+        return next(iter(BACKENDS.values()))
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"JSON-бэкенд {name!r} недоступен, установлены: {', '.join(BACKENDS)}") from None
+
+
+_GETTERS: Dict[Type[Product], Tuple[Tuple[str, ...], Callable[[Product], Tuple[Any, ...]]]] = {
+    cls: (cls._fields, attrgetter(*cls._fields)) for cls in KIND_TAGS
+}
+
+
+def product_to_dict(product: Product) -> Dict[str, Any]:
+    """Словарь полей продукта с тегом "type", совместимый с load_catalog"""
+    cls = type(product)
+    try:
+        fields, getter = _GETTERS[cls]
+    except KeyError:
+        raise TypeError(f"Класс {cls.__name__} не поддерживается кодеком") from None
+    record = dict(zip(fields, getter(product)))
+    record["type"] = KIND_TAGS[cls]
+    return record
+
+
+def category_to_dict(category: Category) -> Dict[str, Any]:
+    return {
+        "name": category.name,
+        "description": category.description,
+        "products": [product_to_dict(product) for product in category.iter_products()],
+    }
+
+
+def iter_encode(
+    categories: Iterable[Category], backend: Optional[Backend] = None, chunk_size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Кодирует категории в JSON по частям: целиком в памяти находится не более chunk_size продуктов"""
+    dumps = (backend or get_backend()).dumps
+    yield b"["
+    for i, category in enumerate(categories):
+        head = dumps({"name": category.name, "description": category.description, "products": []})
+        yield (b"," if i else b"") + head[:-2]  # без закрывающих "]}"
+        products = category.iter_products()
+        separator = b""
+        while True:
+            chunk = [product_to_dict(product) for product in islice(products, chunk_size)]
+            if not chunk:
+                break
+            yield separator + dumps(chunk)[1:-1]
+            separator = b","
+        yield b"]}"
+    yield b"]"
+
+
+def dumps(categories: Iterable[Category], backend: Optional[Backend] = None) -> bytes:
+    return b"".join(iter_encode(categories, backend))
+
+
+def dump(categories: Iterable[Category], file: IO[bytes], backend: Optional[Backend] = None) -> int:
+    """Потоково записывает категории в двоичный файл и возвращает число записанных байт"""
+    written = 0
+    for part in iter_encode(categories, backend):
+        written += file.write(part)
+    return written
+
+
+def decode(data: Sequence[Dict[str, Any]]) -> List[Category]:
+    """Собирает категории из разобранного JSON с выбором класса продукта по полю "type".
+
+    Остаток не проверяется, чтобы распроданные товары переживали цикл записи и чтения.
+    """
+    return [
+        Category(
+            category["name"],
+            category["description"],
+            build_products(
+                ((TYPE_TAGS[record.get("type", "product")], record) for record in category.get("products", ())),
+                validate=False,
+            ),
+        )
+        for category in data
+    ]
+
+
+def loads(data: Any, backend: Optional[Backend] = None) -> List[Category]:
+    return decode((backend or get_backend()).loads(data))
+
+
+def load(file: IO[bytes], backend: Optional[Backend] = None) -> List[Category]:
+    return loads(file.read(), backend)
@@ -1,32 +1,254 @@
+import glob
 import json
+import time
 from pathlib import Path
-from typing import List
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Type
 
-from src.moduls import Category, Product
+from src.identity import IdentityMap
+from src.instrumentation import metrics
+from src.moduls import Category, Product, build_products
+from src.schema import SCHEMAS, SOLD_OUT_SCHEMAS, TYPE_TAGS, LoadReport, Validator
 
+# компактная запись категории, которую дочерний процесс возвращает родителю
+CategoryRecord = Tuple[str, str, List[Tuple[Any, ...]]]
 
-def load_categories_from_json(filepath: str) -> List[Category]:
+_CHUNK_SIZE = 64 * 1024
+_WHITESPACE = " \t\n\r"
+
+
+def _resolve_path(filepath: str) -> Path:
+    """Путь к файлу относительно корня проекта (абсолютные пути не меняются)"""
     base_dir = Path(__file__).resolve().parent.parent  # корень проекта (на 2 уровня вверх от data_loader.py)
-    file_path = base_dir / filepath
-
-    with open(file_path, encoding="utf-8") as file:
-        data = json.load(file)
-
-    categories = []
-    for category_data in data:
-        products = [
-            Product(
-                name=prod["name"],
-                description=prod["description"],
-                price=prod["price"],
-                quantity=prod["quantity"],
+    return base_dir / filepath
+
+
+def _iter_json_array(file: IO[str], chunk_size: int = _CHUNK_SIZE) -> Iterator[Any]:
+    """Потоково разбирает JSON-массив верхнего уровня и выдаёт его элементы по одному.
+
+    В памяти одновременно находится только текущий элемент и один блок чтения.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill(size: int = chunk_size) -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = file.read(size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def next_char() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill():
+                return ""
+
+    if next_char() != "[":
+        raise ValueError("Ожидался JSON-массив категорий")
+    pos += 1
+    if next_char() == "]":
+        return
+
+    while True:
+        next_char()
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # элемент ещё не дочитан целиком: буфер удваивается, чтобы повторный разбор
+                # крупного элемента оставался линейным по его размеру
+                if not fill(max(chunk_size, len(buffer) - pos)):
+                    raise
+                continue
+            # число на границе блока могло быть обрезано — убеждаемся, что за ним есть разделитель
+            if end == len(buffer) and fill():
+                continue
+            break
+        pos = end
+        yield item
+
+        char = next_char()
+        if char == ",":
+            pos += 1
+        elif char == "]":
+            return
+        else:
+            raise ValueError("Некорректный JSON: ожидалась ',' или ']'")
+
+
+def _build_category(category_data: Dict[str, Any]) -> Category:
+    """Создаёт категорию с продуктами из словаря, прочитанного из JSON (без вывода о каждом продукте)"""
+    return Category.from_records((category_data,))[0]
+
+
+def iter_categories_from_json(
+    filepath: str,
+    batch_size: int = 0,
+    callback: Optional[Callable[[List[Category]], None]] = None,
+) -> Iterator[Category]:
+    """Потоково читает файл и выдаёт категории по одной, не загружая весь файл в память.
+
+    Если задан callback, он вызывается с пачками по batch_size категорий (batch_size=0 — по одной).
+    """
+    batch: List[Category] = []
+    with open(_resolve_path(filepath), encoding="utf-8") as file:
+        records = _iter_json_array(file)
+        while True:
+            started = time.perf_counter() if metrics.enabled else 0.0
+            try:
+                category_data = next(records)
+            except StopIteration:
+                break
+            if started:
+                parsed = time.perf_counter()
+                metrics.observe("loader_parse", parsed - started)
+                category = _build_category(category_data)
+                metrics.observe("loader_build", time.perf_counter() - parsed)
+            else:
+                category = _build_category(category_data)
+            if callback is not None:
+                batch.append(category)
+                if len(batch) >= max(batch_size, 1):
+                    callback(batch)
+                    batch = []
+            yield category
+    if callback is not None and batch:
+        callback(batch)
+
+
+def load_categories_from_json(filepath: str) -> List[Category]:
+    return list(iter_categories_from_json(filepath))
+
+
+def _resolve_shards(source: str) -> List[str]:
+    """Файлы-шарды: все *.json в каталоге или пути, подходящие под glob-шаблон"""
+    path = _resolve_path(source)
+    if path.is_dir():
+        return sorted(str(shard) for shard in path.glob("*.json"))
+    return sorted(glob.glob(str(path)))
+
+
+def _parse_shard(path: str) -> List[CategoryRecord]:
+    """Разбирает один шард в кортежи без создания объектов (выполняется в дочернем процессе)"""
+    with open(path, encoding="utf-8") as file:
+        return [
+            (
+                category["name"],
+                category["description"],
+                [(p["name"], p["description"], p["price"], p["quantity"]) for p in category.get("products", ())],
             )
-            for prod in category_data.get("products", [])
+            for category in _iter_json_array(file)
         ]
-        category = Category(
-            name=category_data["name"],
-            description=category_data["description"],
-            products=products,
-        )
-        categories.append(category)
-    return categories
+
+
+def load_categories_from_shards(source: str, max_workers: Optional[int] = None) -> List[Category]:
+    """Параллельно загружает категории из множества JSON-шардов (каталог или glob-шаблон).
+
+    Шарды разбираются в пуле процессов, а объекты создаются в родительском процессе, поэтому счётчики
+    категорий и товаров остаются согласованными. Категории с одинаковым названием из разных шардов сливаются.
+    """
+    paths = _resolve_shards(source)
+    if max_workers == 1 or len(paths) <= 1:
+        parsed: Iterator[List[CategoryRecord]] = map(_parse_shard, paths)
+        return _merge_records(parsed)
+    from concurrent.futures import ProcessPoolExecutor  # пул процессов импортируется только при необходимости
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return _merge_records(pool.map(_parse_shard, paths))
+
+
+def _merge_records(shards: Iterator[List[CategoryRecord]]) -> List[Category]:
+    merged: Dict[str, Tuple[str, List[Tuple[Any, ...]]]] = {}
+    for records in shards:
+        for name, description, products in records:
+            if name in merged:
+                merged[name][1].extend(products)
+            else:
+                merged[name] = (description, products)
+    return [
+        Category(name, description, Product.from_records(products)) for name, (description, products) in merged.items()
+    ]
+
+
+# тег типа -> класс и его проверка; запись без тега — обычный Product
+_VALIDATORS: Dict[Optional[str], Tuple[Type[Product], Validator]] = {
+    None: (Product, SCHEMAS[Product]),
+    **{tag: (cls, SCHEMAS[cls]) for tag, cls in TYPE_TAGS.items()},
+}
+_SOLD_OUT_VALIDATORS: Dict[Optional[str], Tuple[Type[Product], Validator]] = {
+    None: (Product, SOLD_OUT_SCHEMAS[Product]),
+    **{tag: (cls, SOLD_OUT_SCHEMAS[cls]) for tag, cls in TYPE_TAGS.items()},
+}
+
+
+def load_catalog(
+    filepath: str, identity: Optional[IdentityMap] = None, allow_sold_out: bool = False
+) -> Tuple[List[Category], LoadReport]:
+    """Загружает каталог с проверкой схемы и выбором класса продукта по полю "type".
+
+    Некорректные записи не прерывают загрузку, а попадают в отчёт; в категории попадают только валидные продукты.
+    С identity товары с одинаковым SKU (или названием) создаются один раз и разделяются между категориями,
+    а повторяющиеся строки хранятся в одном экземпляре; повтор SKU внутри одной категории и SKU, который не
+    строка и не целое число, попадают в отчёт как ошибки. allow_sold_out принимает товары с нулевым остатком —
+    так читаются каталоги, сохранённые после продаж (например, codec.dump или catalog order --save).
+    """
+    validators = _SOLD_OUT_VALIDATORS if allow_sold_out else _VALIDATORS
+    report = LoadReport()
+    categories: List[Category] = []
+    with open(_resolve_path(filepath), encoding="utf-8") as file:
+        for category_index, data in enumerate(_iter_json_array(file)):
+            if not isinstance(data, dict) or type(data.get("name")) is not str:
+                report.add_error(category_index, None, "категория: нет поля name")
+                continue
+            typed: List[Tuple[Type[Product], Tuple[Any, ...]]] = []
+            keys: List[Any] = []
+            products = data.get("products", [])
+            if not isinstance(products, list):
+                report.add_error(category_index, None, "категория: поле products должно быть списком")
+                products = []
+            append = typed.append
+            # ключи товаров этой категории: повтор не попадает в категорию и отмечается в отчёте
+            seen_keys: Set[Any] = set()
+            for product_index, record in enumerate(products):
+                try:
+                    cls, validate = validators[record.get("type")]
+                except AttributeError:
+                    report.add_error(category_index, product_index, "запись продукта должна быть объектом")
+                    continue
+                except (KeyError, TypeError):  # TypeError — нехешируемое значение type, например список
+                    report.add_error(category_index, product_index, f"неизвестный тип {record.get('type')!r}")
+                    continue
+                try:
+                    values = validate(record)
+                except (TypeError, ValueError) as error:
+                    report.add_error(category_index, product_index, str(error))
+                    continue
+                if identity is not None:
+                    key = record.get("sku", values[0])
+                    if type(key) not in (str, int):
+                        report.add_error(category_index, product_index, "поле sku: ожидался str/int")
+                        continue
+                    if key in seen_keys:
+                        report.add_error(category_index, product_index, f"повтор товара {key!r} в категории")
+                        continue
+                    seen_keys.add(key)
+                    keys.append(key)
+                append((cls, values))
+            if identity is None:
+                items = build_products(typed, False)
+            else:
+                items = identity.resolve((cls, values, key) for (cls, values), key in zip(typed, keys))
+            categories.append(Category(data["name"], str(data.get("description", "")), items))
+            report.loaded += len(typed)
+    return categories, report
@@ -0,0 +1,139 @@
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+from src.moduls import Category, Product
+from src.schema import FIELD_TYPES, SCHEMAS, TYPE_TAGS
+
+# поля продукта, которые можно менять дельтой у существующего товара
+PATCHABLE_FIELDS = ("description", "price", "quantity")
+
+# разобранная и проверенная операция: (операция, категория, описание новой категории, данные)
+Operation = Tuple[str, str, str, Any]
+
+
+def apply_delta(categories: List[Category], lines: Iterable[str]) -> Dict[str, int]:
+    """Применяет дельту в формате JSON Lines к категориям на месте.
+
+    Каждая строка — операция над товаром, найденным по названию внутри категории:
+      {"op": "upsert", "category": "...", "product": {"name": "...", "price": ..., ...}}
+      {"op": "delete", "category": "...", "name": "..."}
+    Новый товар создаётся по полю "type" (как в load_catalog) и проверяется схемой класса, у существующего
+    меняются только поля PATCHABLE_FIELDS. Существующие товары меняются через сеттеры, поэтому агрегаты,
+    индексы и кеши категорий остаются согласованными, а стоимость пропорциональна размеру дельты.
+    Новые категории добавляются в конец списка.
+
+    Дельта сначала целиком разбирается и проверяется: при ошибке в любой строке бросается ValueError с её
+    номером, и категории не меняются.
+    """
+    operations = list(_parse_delta(categories, lines))
+    by_name = {category.name: category for category in categories}
+    stats = {"updated": 0, "inserted": 0, "deleted": 0, "missing": 0, "categories_created": 0}
+
+    for op, category_name, category_description, data in operations:
+        category = by_name.get(category_name)
+        if op == "update":
+            name, patch = data
+            product = category.find_by_name(name)[0]  # type: ignore[union-attr]
+            for field, value in patch.items():
+                if getattr(product, field) != value:
+                    setattr(product, field, value)
+            stats["updated"] += 1
+        elif op == "insert":
+            if category is None:
+                category = Category(category_name, category_description)
+                categories.append(category)
+                by_name[category_name] = category
+                stats["categories_created"] += 1
+            cls, values = data
+            category.add_product(cls.from_records([values])[0])
+            stats["inserted"] += 1
+        else:
+            found = category.find_by_name(data) if category is not None else []
+            if found:
+                category.remove_product(found[0])  # type: ignore[union-attr]
+                stats["deleted"] += 1
+            else:
+                stats["missing"] += 1
+    return stats
+
+
+def _parse_delta(categories: List[Category], lines: Iterable[str]) -> Iterator[Operation]:
+    """Разбирает и проверяет строки дельты, не меняя категорий.
+
+    upsert превращается в update или insert по тому, будет ли товар в категории к моменту применения строки:
+    число товаров с каждым названием, затронутым дельтой, отслеживается поверх текущего состояния категорий.
+    """
+    by_name = {category.name: category for category in categories}
+    counts: Dict[Tuple[str, str], int] = {}
+
+    def count(category_name: str, name: str) -> int:
+        key = (category_name, name)
+        if key not in counts:
+            category = by_name.get(category_name)
+            counts[key] = len(category.find_by_name(name)) if category is not None else 0
+        return counts[key]
+
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("ожидался JSON-объект")
+            op = record.get("op")
+            category_name = record.get("category")
+            if type(category_name) is not str:
+                raise ValueError("нет поля category")
+            if op == "upsert":
+                data = record.get("product")
+                if not isinstance(data, dict) or type(data.get("name")) is not str:
+                    raise ValueError("поле product должно быть объектом с полем name")
+                description = str(record.get("category_description", ""))
+                if count(category_name, data["name"]):
+                    yield "update", category_name, description, (data["name"], _check_patch(data))
+                else:
+                    yield "insert", category_name, description, _check_new(data)
+                    counts[(category_name, data["name"])] = 1
+            elif op == "delete":
+                name = record.get("name")
+                if type(name) is not str:
+                    raise ValueError("нет поля name")
+                if count(category_name, name):
+                    counts[(category_name, name)] -= 1
+                yield "delete", category_name, "", name
+            else:
+                raise ValueError(f"неизвестная операция {op!r}")
+        except (TypeError, ValueError) as error:  # json.JSONDecodeError — наследник ValueError
+            raise ValueError(f"Строка {number}: {error}") from None
+
+
+def _check_new(data: Dict[str, Any]) -> Tuple[Type[Product], Tuple[Any, ...]]:
+    """Класс и поля нового товара; запись проверяется схемой класса, как при загрузке каталога"""
+    tag = data.get("type", "product")
+    try:
+        cls = TYPE_TAGS[tag]
+    except (KeyError, TypeError):  # TypeError — нехешируемое значение type
+        raise ValueError(f"неизвестный тип {tag!r}") from None
+    return cls, SCHEMAS[cls](data)
+
+
+def _check_patch(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Поля существующего товара, которые меняет дельта; остаток может стать нулевым — товар распродан"""
+    patch = {field: data[field] for field in PATCHABLE_FIELDS if field in data}
+    for field, value in patch.items():
+        types = FIELD_TYPES[field]
+        if type(value) not in types:
+            raise ValueError(f"поле {field}: ожидался {'/'.join(t.__name__ for t in types)}")
+    price: Optional[float] = patch.get("price")
+    if price is not None and price < 0:
+        raise ValueError("поле price: цена не может быть отрицательной")
+    quantity: Optional[int] = patch.get("quantity")
+    if quantity is not None and quantity < 0:
+        raise ValueError("поле quantity: количество не может быть отрицательным")
+    return patch
+
+
+def apply_delta_file(categories: List[Category], filepath: str) -> Dict[str, int]:
+    """Применяет дельту из файла JSON Lines, читая его построчно"""
+    with open(filepath, encoding="utf-8") as file:
+        return apply_delta(categories, file)
@@ -0,0 +1,203 @@
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from src.instrumentation import metrics
+from src.moduls import Product
+
+
+class ChangeEvent(NamedTuple):
+    """Изменение поля товара; после объединения old — значение до первого изменения, new — после последнего"""
+
+    product: Product
+    field: str
+    old: Any
+    new: Any
+
+
+Subscriber = Callable[[List[ChangeEvent]], None]
+# ожидающее изменение одного поля товара [товар, поле, old, new] или готовый пакет (см. put_batch)
+_Entry = Union[List[Any], Tuple[ChangeEvent, ...]]
+
+
+class ChangeQueue:
+    """Ограниченная очередь изменений товаров с объединением и пакетной доставкой подписчикам.
+
+    Повторные изменения одного поля товара, пока они ждут доставки, объединяются в одно событие и не занимают
+    новое место. Подписчики получают события пакетами по batch_size: при вызове drain(), из фонового потока
+    (start) или из задачи asyncio (start_async). Если в очереди maxsize ожидающих изменений, производитель
+    ждёт, пока фоновый поток освободит место, а без фонового потока сам доставляет накопленное (обратное
+    давление, при котором очередь не растёт и не теряет события).
+    """
+
+    def __init__(self, maxsize: int = 10_000, batch_size: int = 500) -> None:
+        if maxsize < 1 or batch_size < 1:
+            raise ValueError("Размер очереди и пакета должны быть не меньше 1")
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self._pending: Dict[Hashable, _Entry] = {}
+        # номер эпохи входит в ключ ожидающего изменения: пакет из put_batch начинает новую эпоху, поэтому
+        # изменения после пакета не объединяются с ожидающими до него и доставляются в исходном порядке
+        self._epoch = 0
+        self._subscribers: List[Subscriber] = []
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._stopping = False
+        self._stats = {"queued": 0, "coalesced": 0, "delivered": 0, "batches": 0, "waits": 0, "errors": 0}
+
+    def subscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.remove(subscriber)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def put(self, product: Product, field: str, old: Any, new: Any) -> None:
+        """Ставит изменение в очередь; повторное изменение того же поля объединяется с ожидающим"""
+        while True:
+            with self._cond:
+                key = (id(product), field, self._epoch)
+                entry = self._pending.get(key)
+                if entry is not None:
+                    entry[3] = new  # type: ignore[index]
+                    self._stats["coalesced"] += 1
+                    return
+                if len(self._pending) < self.maxsize:
+                    self._pending[key] = [product, field, old, new]
+                    self._stats["queued"] += 1
+                    self._cond.notify()
+                    return
+                self._stats["waits"] += 1
+                if self._thread is not None and threading.current_thread() is not self._thread:
+                    self._cond.wait()
+                    continue
+            self.drain()  # доставлять некому — производитель освобождает место сам
+
+    def put_batch(self, changes: Iterable[Tuple[Product, str, Any, Any]]) -> None:
+        """Ставит пакет изменений (товар, поле, old, new) целиком.
+
+        Подписчики получат пакет одним вызовом, а в очереди он занимает одно место. Изменения, поставленные
+        после пакета, доставляются после него.
+        """
+        events = tuple(ChangeEvent(*change) for change in changes)
+        if not events:
+            return
+        while True:
+            with self._cond:
+                if len(self._pending) < self.maxsize:
+                    self._pending[object()] = events
+                    self._epoch += 1
+                    self._stats["queued"] += len(events)
+                    self._cond.notify()
+                    return
+                self._stats["waits"] += 1
+                if self._thread is not None and threading.current_thread() is not self._thread:
+                    self._cond.wait()
+                    continue
+            self.drain()
+
+    def drain(self) -> int:
+        """Доставляет все ожидающие изменения пакетами и возвращает число вызовов подписчиков"""
+        with self._cond:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, {}
+            self._cond.notify_all()
+        batches: List[List[ChangeEvent]] = []
+        batch: List[ChangeEvent] = []
+        for entry in pending.values():
+            if type(entry) is tuple:
+                if batch:
+                    batches.append(batch)
+                    batch = []
+                batches.append(list(entry))
+                continue
+            if entry[2] == entry[3]:
+                continue  # изменения взаимно отменились
+            batch.append(ChangeEvent(*entry))
+            if len(batch) >= self.batch_size:
+                batches.append(batch)
+                batch = []
+        if batch:
+            batches.append(batch)
+        for batch in batches:
+            self._deliver(batch)
+        return len(batches)
+
+    def _deliver(self, batch: List[ChangeEvent]) -> None:
+        started = time.perf_counter() if metrics.enabled else 0.0
+        errors = 0
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber(batch)
+            except Exception:
+                errors += 1  # ошибка одного подписчика не мешает остальным
+        with self._cond:
+            self._stats["delivered"] += len(batch)
+            self._stats["batches"] += 1
+            self._stats["errors"] += errors
+        if started:
+            metrics.observe("events_deliver", time.perf_counter() - started)
+            metrics.increment("events_delivered", len(batch))
+
+    def start(self, linger: float = 0.01) -> None:
+        """Запускает фоновый поток доставки; linger — сколько ждать после первого изменения, собирая пакет"""
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, args=(linger,), name="change-queue", daemon=True)
+        self._thread.start()
+
+    def _run(self, linger: float) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                if self._stopping and not self._pending:
+                    return
+            if linger and not self._stopping:
+                time.sleep(linger)
+            self.drain()
+
+    def stop(self) -> None:
+        """Останавливает фоновый поток, доставив оставшиеся изменения"""
+        thread = self._thread
+        if thread is not None:
+            with self._cond:
+                self._stopping = True
+                self._cond.notify_all()
+            thread.join()
+            self._thread = None
+        self.drain()
+
+    def start_async(self, linger: float = 0.01) -> "asyncio.Task[None]":
+        """Запускает доставку задачей в текущем цикле событий: ожидающее доставляется каждые linger секунд"""
+        self._stopping = False
+        self._task = asyncio.get_running_loop().create_task(self._run_async(linger))
+        return self._task
+
+    async def _run_async(self, linger: float) -> None:
+        while not self._stopping:
+            await asyncio.sleep(linger)
+            self.drain()
+
+    async def stop_async(self) -> None:
+        if self._task is not None:
+            self._stopping = True
+            await self._task
+            self._task = None
+        self.drain()
+
+    def stats(self) -> Dict[str, int]:
+        """Счётчики: поставлено, объединено, доставлено событий, число пакетов, ожиданий места и ошибок подписчиков"""
+        with self._cond:
+            return dict(self._stats, pending=len(self._pending))
+
+
+def observe_products(queue: Optional[ChangeQueue]) -> None:
+    """Направляет изменения цены и остатка всех товаров в очередь; None отключает события"""
+    Product._events = queue
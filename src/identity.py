@@ -0,0 +1,95 @@
+import sys
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple, Type
+
+from src.moduls import Product, build_products
+
+# строковые поля, значения которых повторяются между товарами и хранятся в одном экземпляре
+INTERNED_FIELDS = ("description", "color", "country")
+
+
+class IdentityMap:
+    """Карта идентичности товаров и пул строк для загрузки каталога.
+
+    Товар с одним ключом (SKU, а без него — название) создаётся один раз и разделяется между категориями
+    по ссылке, поэтому изменение остатка видно во всех категориях сразу. При повторной встрече побеждает первая
+    запись, расхождения в цене или остатке учитываются в conflicts.
+    """
+
+    def __init__(self) -> None:
+        self.products: Dict[Hashable, Product] = {}
+        self._strings: Dict[str, str] = {}
+        self._interned_positions: Dict[Type[Product], Tuple[int, ...]] = {}
+        self.shared_products = 0
+        self.shared_strings = 0
+        self.conflicts = 0
+        self.bytes_saved = 0
+
+    def intern(self, value: str) -> str:
+        """Возвращает единственный экземпляр строки с таким значением"""
+        pooled = self._strings.setdefault(value, value)
+        if pooled is not value:
+            self.shared_strings += 1
+            self.bytes_saved += sys.getsizeof(value)
+        return pooled
+
+    def _positions(self, cls: Type[Product]) -> Tuple[int, ...]:
+        positions = self._interned_positions.get(cls)
+        if positions is None:
+            positions = self._interned_positions[cls] = tuple(
+                i for i, field in enumerate(cls._fields) if field in INTERNED_FIELDS
+            )
+        return positions
+
+    def resolve(self, typed_records: Iterable[Tuple[Type[Product], Tuple[Any, ...], Hashable]]) -> List[Product]:
+        """Продукты категории по записям (класс, поля, ключ): известные берутся из карты, новые создаются пачкой.
+
+        Повтор ключа внутри одной категории отбрасывается — товар входит в категорию один раз (load_catalog
+        отмечает такие записи в отчёте и сюда не передаёт).
+        """
+        slots: List[Optional[Product]] = []
+        pending: List[Tuple[Type[Product], Tuple[Any, ...]]] = []
+        pending_keys: List[Hashable] = []
+        # ключи, уже встреченные в этой категории -> цена и остаток первой записи
+        seen: Dict[Hashable, Tuple[Any, ...]] = {}
+        for cls, values, key in typed_records:
+            first = seen.get(key)
+            if first is not None:
+                self._count_shared(first, values)
+                continue
+            existing = self.products.get(key)
+            if existing is not None:
+                seen[key] = (existing.price, existing.quantity)
+                self._count_shared(seen[key], values)
+                self.bytes_saved += sys.getsizeof(existing)
+                slots.append(existing)
+                continue
+            seen[key] = values[2:4]
+            positions = self._positions(cls)
+            if positions:
+                values = tuple(self.intern(v) if i in positions else v for i, v in enumerate(values))
+            pending.append((cls, values))
+            pending_keys.append(key)
+            slots.append(None)
+
+        created = build_products(pending, validate=False)
+        self.products.update(zip(pending_keys, created))
+        fresh = iter(created)
+        return [product if product is not None else next(fresh) for product in slots]
+
+    def _count_shared(self, first: Tuple[Any, ...], values: Tuple[Any, ...]) -> None:
+        """Учитывает повторную запись: её строки и числа не создаются, цена и остаток сверяются с первой"""
+        self.shared_products += 1
+        self.bytes_saved += sum(map(sys.getsizeof, values))
+        if first != values[2:4]:
+            self.conflicts += 1
+
+    def report(self) -> Dict[str, int]:
+        """Сводка дедупликации: уникальные и разделённые товары и строки, оценка сэкономленной памяти в байтах"""
+        return {
+            "products": len(self.products),
+            "shared_products": self.shared_products,
+            "strings": len(self._strings),
+            "shared_strings": self.shared_strings,
+            "conflicts": self.conflicts,
+            "bytes_saved": self.bytes_saved,
+        }
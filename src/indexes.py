@@ -0,0 +1,121 @@
+from bisect import bisect_left, bisect_right, insort
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Tuple
+
+if TYPE_CHECKING:
+    from src.moduls import Product
+
+# атрибуты наследников Product, по которым строятся хеш-индексы
+INDEXED_ATTRIBUTES: Tuple[str, ...] = ("memory", "color", "country")
+
+
+class ProductIndex:
+    """Вторичные индексы продуктов категории: по названию, по цене и по атрибутам наследников.
+
+    Цена отслеживается при изменениях, название и атрибуты наследников считаются неизменными.
+    """
+
+    def __init__(self) -> None:
+        self._by_name: Dict[str, List["Product"]] = {}
+        # отсортированные ключи (цена, id продукта) и продукты по id;
+        # если продукт входит в категорию несколько раз, его одинаковые ключи стоят рядом
+        self._price_keys: List[Tuple[float, int]] = []
+        self._by_id: Dict[int, "Product"] = {}
+        self._by_attr: Dict[str, Dict[Any, List["Product"]]] = {attr: {} for attr in INDEXED_ATTRIBUTES}
+
+    def add(self, product: "Product") -> None:
+        """Добавляет продукт во все индексы"""
+        insort(self._price_keys, self._register(product))
+
+    def extend(self, products: Iterable["Product"]) -> None:
+        """Добавляет много продуктов сразу: индекс цен сортируется один раз"""
+        keys = self._price_keys
+        keys.extend(map(self._register, products))
+        keys.sort()
+
+    def _register(self, product: "Product") -> Tuple[float, int]:
+        """Заносит продукт в хеш-индексы и возвращает его ключ для индекса цен"""
+        by_name = self._by_name
+        bucket = by_name.get(product.name)
+        if bucket is None:
+            by_name[product.name] = [product]
+        else:
+            bucket.append(product)
+        self._by_id[id(product)] = product
+        for attr in _indexed_attributes(type(product)):
+            self._by_attr[attr].setdefault(getattr(product, attr), []).append(product)
+        return (product.price, id(product))
+
+    def remove(self, product: "Product") -> None:
+        """Удаляет продукт из всех индексов"""
+        _remove_from_bucket(self._by_name, product.name, product)
+        keys = self._price_keys
+        key = (product.price, id(product))
+        position = bisect_left(keys, key)
+        del keys[position]
+        if not (position < len(keys) and keys[position] == key):
+            del self._by_id[id(product)]
+        for attr in _indexed_attributes(type(product)):
+            _remove_from_bucket(self._by_attr[attr], getattr(product, attr), product)
+
+    def reprice(self, product: "Product", old_price: float) -> None:
+        """Переносит продукт на новую позицию в индексе цен"""
+        keys = self._price_keys
+        old_key = (old_price, id(product))
+        start = stop = bisect_left(keys, old_key)
+        while stop < len(keys) and keys[stop] == old_key:
+            stop += 1
+        # при повторном уведомлении о том же изменении ключей со старой ценой уже нет
+        del keys[start:stop]
+        for _ in range(stop - start):
+            insort(keys, (product.price, id(product)))
+
+    def reprice_many(self, changes: Iterable[Tuple["Product", float]]) -> None:
+        """Переносит много продуктов (продукт, старая цена) на новые позиции в индексе цен.
+
+        При крупных изменениях индекс пересортируется один раз вместо сдвига списка на каждый продукт.
+        """
+        changes = list(changes)
+        if len(changes) <= 64:
+            for product, old_price in changes:
+                self.reprice(product, old_price)
+            return
+        by_id = self._by_id
+        keys = [(by_id[product_id].price, product_id) for _, product_id in self._price_keys]
+        keys.sort()
+        self._price_keys = keys
+
+    def by_name(self, name: str) -> List["Product"]:
+        return list(self._by_name.get(name, ()))
+
+    def by_attribute(self, attr: str, value: Any) -> List["Product"]:
+        if attr not in self._by_attr:
+            raise KeyError(f"Атрибут {attr} не индексируется")
+        return list(self._by_attr[attr].get(value, ()))
+
+    def price_range(self, low: float, high: float) -> Iterator["Product"]:
+        """Продукты с ценой в диапазоне [low, high] по возрастанию цены"""
+        keys = self._price_keys
+        start = bisect_left(keys, (low, 0))
+        stop = bisect_right(keys, (high, float("inf")))
+        return (self._by_id[keys[position][1]] for position in range(start, stop))
+
+    def cheapest(self, n: int) -> List["Product"]:
+        return [self._by_id[key] for _, key in self._price_keys[:n]]
+
+
+@lru_cache(maxsize=None)
+def _indexed_attributes(product_cls: type) -> Tuple[str, ...]:
+    """Индексируемые атрибуты, которые есть у класса продукта (вычисляется один раз на класс)"""
+    fields = getattr(product_cls, "_fields", ())
+    return tuple(attr for attr in INDEXED_ATTRIBUTES if attr in fields)
+
+
+def _remove_from_bucket(index: Dict[Any, List["Product"]], key: Any, product: "Product") -> None:
+    bucket = index[key]
+    for position, item in enumerate(bucket):
+        if item is product:
+            del bucket[position]
+            break
+    if not bucket:
+        del index[key]
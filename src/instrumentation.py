@@ -0,0 +1,155 @@
+import io
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import pstats
+
+# границы корзин гистограмм времени, секунды
+DEFAULT_BUCKETS: Tuple[float, ...] = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 0.1, 1.0, 10.0)
+
+
+class Histogram:
+    """Гистограмма длительностей с фиксированными корзинами (как в Prometheus)"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class Metrics:
+    """Счётчики и гистограммы горячих путей каталога.
+
+    Выключены по умолчанию: в коде каталога измерения выполняются только при metrics.enabled,
+    поэтому выключенная инструментация стоит одной проверки атрибута.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._counters: Dict[str, int] = {}
+        self._histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Измеряет длительность блока, если инструментация включена"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        """Текущие значения в виде словаря"""
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "histograms": {
+                    name: {
+                        "count": h.count,
+                        "sum": h.total,
+                        "buckets": dict(zip([*map(str, h.buckets), "+Inf"], _cumulative(h.counts))),
+                    }
+                    for name, h in self._histograms.items()
+                },
+            }
+
+    def to_prometheus(self, prefix: str = "catalog") -> str:
+        """Текущие значения в текстовом формате Prometheus"""
+        lines: List[str] = []
+        with self._lock:
+            for name, value in sorted(self._counters.items()):
+                metric = f"{prefix}_{name}_total"
+                lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+            for name, h in sorted(self._histograms.items()):
+                metric = f"{prefix}_{name}_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                for bound, count in zip([*map(repr, h.buckets), "+Inf"], _cumulative(h.counts)):
+                    lines.append(f'{metric}_bucket{{le="{bound}"}} {count}')
+                lines += [f"{metric}_sum {h.total}", f"{metric}_count {h.count}"]
+        return "\n".join(lines) + "\n"
+
+
+def _cumulative(counts: List[int]) -> List[int]:
+    result, total = [], 0
+    for count in counts:
+        total += count
+        result.append(total)
+    return result
+
+
+metrics = Metrics()
+
+
+class ProfileReport:
+    """Результат profile(): текстовый отчёт cProfile и крупнейшие места выделения памяти"""
+
+    def __init__(self) -> None:
+        self.stats: Optional["pstats.Stats"] = None
+        self.cpu = ""
+        self.memory: List[str] = []
+        self.peak_bytes = 0
+
+
+@contextmanager
+def profile(limit: int = 20, trace_memory: bool = True) -> Iterator[ProfileReport]:
+    """Снимает профиль cProfile (и tracemalloc) вокруг блока:
+
+    with profile() as report:
+        load_categories_from_json("data/products.json")
+    print(report.cpu)
+    """
+    # профилировщики импортируются только здесь, чтобы не замедлять импорт каталога
+    import cProfile
+    import pstats
+    import tracemalloc
+
+    report = ProfileReport()
+    profiler = cProfile.Profile()
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    profiler.enable()
+    try:
+        yield report
+    finally:
+        profiler.disable()
+        stream = io.StringIO()
+        report.stats = pstats.Stats(profiler, stream=stream).sort_stats("cumulative")
+        report.stats.print_stats(limit)
+        report.cpu = stream.getvalue()
+        if trace_memory:
+            report.peak_bytes = tracemalloc.get_traced_memory()[1]
+            top = tracemalloc.take_snapshot().statistics("lineno")[:limit]
+            report.memory = [str(stat) for stat in top]
+        if started_tracing:
+            tracemalloc.stop()
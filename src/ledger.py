@@ -0,0 +1,279 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from src.codec import Backend, get_backend
+from src.moduls import Order
+
+SEGMENT_PREFIX = "segment-"
+SNAPSHOT_NAME = "snapshot.json"
+
+
+class LedgerEntry(NamedTuple):
+    """Запись журнала заказов; в сегменте хранится как JSON-массив в одной строке"""
+
+    seq: int
+    timestamp: float
+    category: str
+    product: str
+    quantity: int
+    amount: float
+
+
+class _HourlySeries:
+    """Продажи категории по часам с накопленными суммами: сумма за интервал часов — два поиска bisect"""
+
+    def __init__(self) -> None:
+        self.hours: List[int] = []
+        self.units: List[int] = []  # накопленные суммы по часам включительно
+        self.revenue: List[float] = []
+
+    def add(self, hour: int, units: int, revenue: float) -> None:
+        hours = self.hours
+        if hours and hours[-1] == hour:
+            self.units[-1] += units
+            self.revenue[-1] += revenue
+            return
+        if not hours or hours[-1] < hour:
+            hours.append(hour)
+            self.units.append((self.units[-1] if self.units else 0) + units)
+            self.revenue.append((self.revenue[-1] if self.revenue else 0.0) + revenue)
+            return
+        # запись задним числом: редкий случай, накопленные суммы после неё сдвигаются
+        index = bisect_left(hours, hour)
+        if hours[index] != hour:
+            hours.insert(index, hour)
+            self.units.insert(index, self.units[index - 1] if index else 0)
+            self.revenue.insert(index, self.revenue[index - 1] if index else 0.0)
+        for i in range(index, len(hours)):
+            self.units[i] += units
+            self.revenue[i] += revenue
+
+    def between(self, start: int, end: int) -> Tuple[int, float]:
+        """Продажи за часы [start, end)"""
+        first, last = bisect_left(self.hours, start), bisect_left(self.hours, end)
+        if last <= first:
+            return 0, 0.0
+        units, revenue = self.units[last - 1], self.revenue[last - 1]
+        if first:
+            units -= self.units[first - 1]
+            revenue -= self.revenue[first - 1]
+        return units, revenue
+
+    def rows(self) -> List[Tuple[int, int, float]]:
+        """Продажи по каждому часу (без накопления) — для снимка"""
+        previous_units, previous_revenue = 0, 0.0
+        rows = []
+        for hour, units, revenue in zip(self.hours, self.units, self.revenue):
+            rows.append((hour, units - previous_units, revenue - previous_revenue))
+            previous_units, previous_revenue = units, revenue
+        return rows
+
+
+class Ledger:
+    """Журнал заказов только на добавление со сводками продаж в памяти.
+
+    Записи пишутся строками JSON в сегменты segment-NNNNNN.jsonl каталога; после segment_size записей
+    начинается новый сегмент. Каждые snapshot_every записей сводки сохраняются в snapshot.json, поэтому при
+    открытии воспроизводятся только записи после снимка. Сводки по товарам, категориям и часам обновляются
+    при каждой записи: выручка и число проданных единиц отдаются за O(1), за интервал часов — за O(log n).
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_size: int = 100_000,
+        snapshot_every: int = 10_000,
+        backend: Optional[Backend] = None,
+    ) -> None:
+        if segment_size < 1 or snapshot_every < 1:
+            raise ValueError("Размер сегмента и период снимка должны быть не меньше 1")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_size = segment_size
+        self.snapshot_every = snapshot_every
+        self._backend = backend or get_backend()
+        self._lock = threading.Lock()
+
+        self.seq = 0
+        self._products: Dict[str, List[Any]] = {}  # товар -> [единиц, выручка]
+        self._categories: Dict[str, List[Any]] = {}
+        self._hourly: Dict[str, _HourlySeries] = {}
+        self._snapshot_seq = 0
+        self._segment = 0
+        self._segment_entries = 0
+        self._file: Optional[IO[bytes]] = None
+        self._recover()
+
+    def _segment_path(self, number: int) -> Path:
+        return self.directory / f"{SEGMENT_PREFIX}{number:06d}.jsonl"
+
+    def _segments(self) -> List[int]:
+        paths = self.directory.glob(f"{SEGMENT_PREFIX}*.jsonl")
+        return sorted(int(path.stem[len(SEGMENT_PREFIX) :]) for path in paths)
+
+    def _read_segment(self, number: int) -> Iterator[LedgerEntry]:
+        with open(self._segment_path(number), "rb") as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    return  # недописанная строка после сбоя
+                yield LedgerEntry(*self._backend.loads(line))
+
+    def _recover(self) -> None:
+        snapshot_path = self.directory / SNAPSHOT_NAME
+        first_segment = 0
+        if snapshot_path.exists():
+            state = self._backend.loads(snapshot_path.read_bytes())
+            self.seq = self._snapshot_seq = state["seq"]
+            first_segment = state["segment"]
+            self._products = state["products"]
+            self._categories = state["categories"]
+            for category, rows in state["hourly"].items():
+                series = self._hourly[category] = _HourlySeries()
+                for hour, units, revenue in rows:
+                    series.add(hour, units, revenue)
+
+        segments = self._segments()
+        for number in segments:
+            if number < first_segment:
+                continue
+            count = 0
+            for entry in self._read_segment(number):
+                count += 1
+                if entry.seq > self.seq:
+                    self._apply(entry)
+            self._segment, self._segment_entries = number, count
+        if segments:
+            self._truncate_partial(self._segment_path(self._segment))
+
+    @staticmethod
+    def _truncate_partial(path: Path) -> None:
+        """Отрезает недописанную последнюю строку, чтобы новые записи начинались с новой строки"""
+        data = path.read_bytes()
+        end = data.rfind(b"\n") + 1
+        if end != len(data):
+            with open(path, "r+b") as file:
+                file.truncate(end)
+
+    def _apply(self, entry: LedgerEntry) -> None:
+        self.seq = entry.seq
+        product = self._products.get(entry.product)
+        if product is None:
+            product = self._products[entry.product] = [0, 0.0]
+        product[0] += entry.quantity
+        product[1] += entry.amount
+        category = self._categories.get(entry.category)
+        if category is None:
+            category = self._categories[entry.category] = [0, 0.0]
+        category[0] += entry.quantity
+        category[1] += entry.amount
+        series = self._hourly.get(entry.category)
+        if series is None:
+            series = self._hourly[entry.category] = _HourlySeries()
+        series.add(int(entry.timestamp // 3600), entry.quantity, entry.amount)
+
+    def append(self, order: Order, category: Optional[str] = None, timestamp: Optional[float] = None) -> LedgerEntry:
+        """Добавляет заказ в журнал. Категория по умолчанию — первая категория, в которую входит товар"""
+        return self.extend([order], category, timestamp)[0]
+
+    def extend(
+        self, orders: Iterable[Order], category: Optional[str] = None, timestamp: Optional[float] = None
+    ) -> List[LedgerEntry]:
+        """Добавляет пакет заказов одной записью в файл"""
+        when = time.time() if timestamp is None else timestamp
+        with self._lock:
+            entries = []
+            lines = []
+            for order in orders:
+                owners = order.product._owners
+                name = category if category is not None else owners[0].name if owners else ""
+                entry = LedgerEntry(self.seq + 1, when, name, order.name, order.quantity, order.total_price)
+                self._apply(entry)
+                entries.append(entry)
+                lines.append(self._backend.dumps(tuple(entry)) + b"\n")
+            self._write(lines)
+            if self.seq - self._snapshot_seq >= self.snapshot_every:
+                self._write_snapshot()
+        return entries
+
+    def _write(self, lines: List[bytes]) -> None:
+        for line in lines:
+            if self._file is None or self._segment_entries >= self.segment_size:
+                self._rotate()
+            assert self._file is not None
+            self._file.write(line)
+            self._segment_entries += 1
+        if self._file is not None:
+            self._file.flush()
+
+    def _rotate(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        if self._segment_entries >= self.segment_size:
+            self._segment += 1
+            self._segment_entries = 0
+        self._file = open(self._segment_path(self._segment), "ab")
+
+    def snapshot(self) -> None:
+        """Сохраняет сводки на диск; при следующем открытии записи до снимка не воспроизводятся"""
+        with self._lock:
+            self._write_snapshot()
+
+    def _write_snapshot(self) -> None:
+        state = {
+            "seq": self.seq,
+            "segment": self._segment,
+            "products": self._products,
+            "categories": self._categories,
+            "hourly": {category: series.rows() for category, series in self._hourly.items()},
+        }
+        path = self.directory / SNAPSHOT_NAME
+        temporary = path.with_suffix(".tmp")
+        temporary.write_bytes(self._backend.dumps(state))
+        os.replace(temporary, path)  # атомарная замена: снимок либо старый, либо новый целиком
+        self._snapshot_seq = self.seq
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def __enter__(self) -> "Ledger":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def product_sales(self, product: str) -> Tuple[int, float]:
+        """Проданные единицы и выручка по товару"""
+        units, revenue = self._products.get(product, (0, 0.0))
+        return units, revenue
+
+    def category_sales(self, category: str) -> Tuple[int, float]:
+        """Проданные единицы и выручка по категории"""
+        units, revenue = self._categories.get(category, (0, 0.0))
+        return units, revenue
+
+    def category_sales_between(self, category: str, start: float, end: float) -> Tuple[int, float]:
+        """Продажи категории за часы, в которые попадают моменты [start, end) (Unix-время)"""
+        series = self._hourly.get(category)
+        if series is None:
+            return 0, 0.0
+        return series.between(int(start // 3600), int(-(-end // 3600)))
+
+    def hourly_revenue(self, category: str) -> List[Tuple[int, int, float]]:
+        """Продажи категории по часам: (номер часа с начала эпохи, единиц, выручка)"""
+        series = self._hourly.get(category)
+        return series.rows() if series is not None else []
+
+    def entries(self) -> Iterator[LedgerEntry]:
+        """Все записи журнала по порядку — полное воспроизведение, например для аудита"""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+        for number in self._segments():
+            yield from self._read_segment(number)
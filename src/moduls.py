@@ -1,10 +1,50 @@
-from abc import ABC, abstractmethod
-from typing import Any, List, Optional
+import itertools
+import threading
+import time
+from abc import ABC, ABCMeta, abstractmethod
+from contextlib import ExitStack, nullcontext
+from operator import attrgetter, mul
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    ContextManager,
+    cast,
+)
+
+from src import analytics
+from src.indexes import INDEXED_ATTRIBUTES, ProductIndex
+from src.instrumentation import metrics
+from src.pipeline import Pipeline
+from src.registry import current_registry
+from src.render_cache import RenderCache
+
+if TYPE_CHECKING:
+    from src.events import ChangeQueue
+
+# запись продукта: словарь полей или кортеж/список значений в порядке _fields
+ProductRecord = Union[Mapping[str, Any], Tuple[Any, ...], List[Any]]
+CreationHook = Callable[[Dict[str, Any]], None]
+P = TypeVar("P", bound="Product")
 
 
 class BaseProduct(ABC):
     """Абстрактный класс для всех продуктов"""
 
+    __slots__ = ("name", "description")
+
     @abstractmethod
     def __init__(self, name: str, description: str, price: float, quantity: int):
         self.name = name
@@ -12,6 +52,27 @@ class BaseProduct(ABC):
         self.price = price
         self.quantity = quantity
 
+    # хранение price и quantity определяют наследники (см. Product)
+    @property
+    @abstractmethod
+    def price(self) -> float:
+        pass
+
+    @price.setter
+    @abstractmethod
+    def price(self, value: float) -> None:
+        pass
+
+    @property
+    @abstractmethod
+    def quantity(self) -> int:
+        pass
+
+    @quantity.setter
+    @abstractmethod
+    def quantity(self, value: int) -> None:
+        pass
+
     @abstractmethod
     def __add__(self, other: "BaseProduct") -> float:
         pass
@@ -26,15 +87,31 @@ class BaseEntity(ABC):
         self.quantity = quantity
 
 
+def print_creation_event(event: Dict[str, Any]) -> None:
+    """Обработчик по умолчанию: печатает информацию о созданном объекте"""
+    print(f"Создан объект класса {event['class']} с параметрами {event['params']}")
+
+
 class InitInfoMixin:
     """Миксин для вывода информации о созданном объекте"""
 
+    __slots__ = ()
+    _creation_hook: Optional[CreationHook] = print_creation_event
+    _sample_every: int = 1
+    _created: int = 0
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
-        print(f"Создан объект класса {self.__class__.__name__} с параметрами {kwargs or args}")
+        hook = InitInfoMixin._creation_hook
+        if hook is not None:
+            InitInfoMixin._created += 1
+            if InitInfoMixin._created % InitInfoMixin._sample_every == 0:
+                hook({"event": "created", "class": self.__class__.__name__, "params": kwargs or args})
 
     def __repr__(self) -> str:
-        return f"<{self.__class__.__name__}: {vars(self)}>"
+        fields = getattr(self, "_fields", None)
+        attrs = {field: getattr(self, field) for field in fields} if fields is not None else vars(self)
+        return f"<{self.__class__.__name__}: {attrs}>"
 
 
 class ZeroQuantityError(ValueError):
@@ -43,17 +120,99 @@ class ZeroQuantityError(ValueError):
     pass
 
 
+def set_creation_hook(hook: Optional[CreationHook], sample_every: int = 1) -> None:
+    """Задаёт обработчик событий создания объектов; None отключает вывод.
+
+    sample_every=N передаёт в обработчик только каждое N-е событие.
+    """
+    if sample_every < 1:
+        raise ValueError("sample_every должен быть не меньше 1")
+    InitInfoMixin._creation_hook = hook
+    InitInfoMixin._sample_every = sample_every
+    InitInfoMixin._created = 0
+
+
+_NO_OWNERS = nullcontext()
+
+
+def _owner_locks(owners: Tuple["Category", ...]) -> ContextManager[Any]:
+    """Блокировки категорий-владельцев продукта; несколько берутся по возрастанию номера категории"""
+    if len(owners) == 1:
+        return owners[0]._lock
+    if not owners:
+        return _NO_OWNERS
+    stack = ExitStack()
+    for owner in sorted(set(owners), key=attrgetter("_uid")):
+        stack.enter_context(owner._lock)
+    return stack
+
+
 class Product(InitInfoMixin, BaseProduct):
     """Класс для общего продукта"""
 
+    __slots__ = ("_price", "_quantity", "_owners", "_rendered")
+    _fields: Tuple[str, ...] = ("name", "description", "price", "quantity")
+    # поля, значения которых хранятся в слотах под другим именем
+    _storage: Dict[str, str] = {"price": "_price", "quantity": "_quantity"}
+    # очередь событий изменения цены и остатка (см. src.events.observe_products); None — события выключены
+    _events: Optional["ChangeQueue"] = None
+
     def __init__(self, name: str, description: str, price: float, quantity: int):
+        started = time.perf_counter() if metrics.enabled else 0.0
         if quantity == 0:
             raise ZeroQuantityError("Товар с нулевым количеством не может быть добавлен")
+        self._owners: Tuple["Category", ...] = ()
+        self._rendered: Optional[str] = None
+        # слоты заполняются заранее, чтобы сеттерам всегда было с чем сравнивать старое значение
+        self._price = price
+        self._quantity = quantity
         super().__init__(name, description, price, quantity)
+        if started:
+            metrics.observe("product_init", time.perf_counter() - started)
+            metrics.increment("products_created")
+
+    @property
+    def price(self) -> float:
+        return self._price
+
+    @price.setter
+    def price(self, value: float) -> None:
+        owners = self._owners
+        # запись и пересчёт агрегатов идут под блокировками владельцев: иначе одновременная смена цены и
+        # остатка из разных потоков прибавила бы к стоимости остатков приращения, посчитанные по чужим значениям
+        with _owner_locks(owners):
+            old = self._price
+            self._price = value
+            self._rendered = None
+            for owner in owners:
+                owner._on_product_changed(self, "price", old, value)
+        events = self._events
+        if events is not None and old != value:
+            events.put(self, "price", old, value)
+
+    @property
+    def quantity(self) -> int:
+        return self._quantity
+
+    @quantity.setter
+    def quantity(self, value: int) -> None:
+        owners = self._owners
+        with _owner_locks(owners):
+            old = self._quantity
+            self._quantity = value
+            self._rendered = None
+            for owner in owners:
+                owner._on_product_changed(self, "quantity", old, value)
+        events = self._events
+        if events is not None and old != value:
+            events.put(self, "quantity", old, value)
 
     def __str__(self) -> str:
-        """Возвращает строковое представление продукта"""
-        return f"{self.name}, {self.price} руб. Остаток: {self.quantity} шт."
+        """Возвращает строковое представление продукта (кешируется до изменения цены или остатка)"""
+        rendered = self._rendered
+        if rendered is None:
+            rendered = self._rendered = f"{self.name}, {self.price} руб. Остаток: {self.quantity} шт."
+        return rendered
 
     def __add__(self, other: "BaseProduct") -> float:
         """Возвращает сумму стоимости остатков двух продуктов"""
@@ -62,10 +221,68 @@ class Product(InitInfoMixin, BaseProduct):
 
         return self.price * self.quantity + other.price * other.quantity
 
+    @classmethod
+    def from_records(cls: Type[P], records: Iterable[ProductRecord], validate: bool = True) -> List[P]:
+        """Массово создаёт продукты из словарей или кортежей полей без вызова обработчика создания.
+
+        validate=False пропускает проверку нулевого остатка — для восстановления сохранённого состояния,
+        где товар мог быть распродан.
+        """
+        started = time.perf_counter() if metrics.enabled else 0.0
+        fields = cls._fields
+        # дескрипторы слотов: запись через них быстрее, чем setattr по имени
+        setters = [getattr(cls, cls._storage.get(field, field)).__set__ for field in fields]
+        # mypy видит в атрибутах-слотах поля экземпляра, поэтому дескрипторы берутся через getattr
+        set_owners = getattr(Product, "_owners").__set__
+        set_rendered = getattr(Product, "_rendered").__set__
+        new = object.__new__
+        products: List[P] = []
+        append = products.append
+        for record in records:
+            values = record if isinstance(record, (tuple, list)) else [record[field] for field in fields]
+            if len(values) != len(fields):
+                raise ValueError(f"Ожидалось {len(fields)} полей для {cls.__name__}, получено {len(values)}")
+            if validate and values[3] == 0:
+                raise ZeroQuantityError("Товар с нулевым количеством не может быть добавлен")
+            product = new(cls)
+            set_owners(product, ())
+            set_rendered(product, None)
+            for setter, value in zip(setters, values):
+                setter(product, value)
+            append(product)
+        if started:
+            metrics.observe("product_bulk_build", time.perf_counter() - started)
+            metrics.increment("products_created", len(products))
+        return products
+
+
+def build_products(
+    typed_records: Iterable[Tuple[Type[Product], ProductRecord]], validate: bool = True
+) -> List[Product]:
+    """Массово создаёт продукты разных классов в исходном порядке.
+
+    Подряд идущие записи одного класса передаются в from_records одной пачкой.
+    """
+    result: List[Product] = []
+    run: List[ProductRecord] = []
+    run_cls: Optional[Type[Product]] = None
+    for cls, record in typed_records:
+        if cls is not run_cls:
+            if run_cls is not None:
+                result.extend(run_cls.from_records(run, validate))
+            run, run_cls = [], cls
+        run.append(record)
+    if run_cls is not None:
+        result.extend(run_cls.from_records(run, validate))
+    return result
+
 
 class Smartphone(Product):
     """Класс, представляющий смартфон, как товар"""
 
+    __slots__ = ("efficiency", "model", "memory", "color")
+    _fields = Product._fields + __slots__
+
     def __init__(
         self,
         name: str,
@@ -87,6 +304,9 @@ class Smartphone(Product):
 class LawnGrass(Product):
     """Класс, представляющий газонную траву, как товар"""
 
+    __slots__ = ("country", "germination_period", "color")
+    _fields = Product._fields + __slots__
+
     def __init__(
         self,
         name: str,
@@ -103,78 +323,434 @@ class LawnGrass(Product):
         self.color = color
 
 
-class Category(BaseEntity):
-    category_count: int = 0
-    product_count: int = 0
+class CategorySnapshot(NamedTuple):
+    """Неизменяемая версия категории: состав, цены и остатки на момент публикации и агрегаты по ним.
+
+    Продукты — живые объекты, их поля могут меняться и после публикации; значения этой версии хранятся
+    в prices и quantities (в порядке products), и агрегаты посчитаны именно по ним.
+    """
+
+    version: int
+    products: Tuple[Product, ...]
+    prices: Tuple[float, ...]
+    quantities: Tuple[int, ...]
+    total_price: float
+    total_quantity: int
+    stock_value: float
+
+
+_get_price = attrgetter("_price")
+_get_quantity = attrgetter("_quantity")
+
+
+class _CategoryMeta(ABCMeta):
+    """Метакласс Category: счётчики на уровне класса читаются из текущего реестра каталога"""
+
+    @property
+    def category_count(cls) -> int:
+        return current_registry().category_count
+
+    @category_count.setter
+    def category_count(cls, value: int) -> None:
+        current_registry().categories.set(value)
+
+    @property
+    def product_count(cls) -> int:
+        return current_registry().product_count
+
+    @product_count.setter
+    def product_count(cls, value: int) -> None:
+        current_registry().products.set(value)
+
+
+class Category(BaseEntity, metaclass=_CategoryMeta):
+    """Категория товаров; счётчики category_count и product_count хранятся в реестре (src.registry)"""
+
+    # общий кеш строкового представления категорий; можно заменить на свой RenderCache
+    render_cache: RenderCache = RenderCache()
+    _uids = itertools.count()
 
     def __init__(self, name: str, description: str, products: Optional[List[Product]] = None) -> None:
-        super().__init__(name, quantity=len(products) if products else 0)
+        items = list(products) if products else []
+        super().__init__(name, quantity=len(items))
         self.description = description
-        self.__products = products if products else []
-
-        Category.category_count += 1
-        Category.product_count += len(self.__products)
+        # удалённые продукты оставляют на своём месте None, список уплотняется, когда их больше половины
+        self.__products = cast(List[Optional[Product]], items)
+        self.__holes = 0
+        # id продукта -> позиция в списке; строится при первом удалении, чтобы удаление не искало продукт перебором
+        self.__positions: Optional[Dict[int, int]] = None
+        for product in items:
+            product._owners += (self,)
+        # агрегаты считаются один раз, дальше поддерживаются инкрементально
+        self._total_price: float = sum((p.price for p in items), 0.0)
+        self._total_quantity: int = sum(p.quantity for p in items)
+        self._stock_value: float = sum((p.price * p.quantity for p in items), 0.0)
+        self._index = ProductIndex()
+        self._index.extend(items)
+        # защищает список и агрегаты: остатки товаров могут меняться из разных потоков (см. src.orders)
+        self._lock = threading.Lock()
+        # загрузчик отложенных продуктов (см. deferred); None — продукты уже в списке
+        self._loader: Optional[Callable[[], List[Product]]] = None
+        # уникальный номер и версия содержимого — ключ кеша строкового представления
+        self._uid = next(Category._uids)
+        self._version = 0
+        # опубликованная версия для читателей (copy-on-write): писатели под блокировкой только сбрасывают ссылку,
+        # а новая версия собирается при первом чтении; кортеж состава переиспользуется, пока состав не менялся
+        self._snapshot: Optional[CategorySnapshot] = None
+        self._members: Optional[Tuple[Product, ...]] = None
+
+        registry = current_registry()
+        registry.categories.add(1)
+        registry.products.add(len(self.__products))
+
+    @classmethod
+    def from_records(
+        cls, records: Iterable[Mapping[str, Any]], product_cls: Type[Product] = Product
+    ) -> List["Category"]:
+        """Массово создаёт категории из словарей с ключами name, description и products"""
+        return [
+            cls(record["name"], record["description"], product_cls.from_records(record.get("products", ())))
+            for record in records
+        ]
+
+    @classmethod
+    def deferred(
+        cls,
+        name: str,
+        description: str,
+        count: int,
+        totals: Tuple[float, int, float],
+        loader: Callable[[], List[Product]],
+    ) -> "Category":
+        """Категория с отложенными продуктами: загрузчик вызывается при первом обращении к ним.
+
+        totals — заранее посчитанные сумма цен, сумма остатков и стоимость остатков, поэтому __str__ и
+        middle_price работают без создания продуктов (см. src.snapshot).
+        """
+        category = cls(name, description)
+        category.quantity = count
+        category._total_price, category._total_quantity, category._stock_value = totals
+        category._loader = loader
+        current_registry().products.add(count)
+        return category
+
+    def _load(self) -> None:
+        """Создаёт отложенные продукты, если они ещё не загружены"""
+        if self._loader is None:
+            return
+        with self._lock:
+            loader = self._loader
+            if loader is None:
+                return
+            items = loader()
+            for product in items:
+                product._owners += (self,)
+            self.__products = cast(List[Optional[Product]], items)
+            self.__holes = 0
+            self.__positions = None
+            self._index.extend(items)
+            self._loader = None
+            self._snapshot = self._members = None
+
+    def __attach(self, product: Product) -> None:
+        """Добавляет продукт в список, учитывает его в агрегатах и подписывает категорию на его изменения"""
+        self._load()
+        with self._lock:
+            if self.__positions is not None:
+                self.__positions[id(product)] = len(self.__products)
+            self.__products.append(product)
+            self._index.add(product)
+            product._owners += (self,)
+            self._version += 1
+            self._snapshot = self._members = None
+            self.quantity += 1
+            self._total_price += product.price
+            self._total_quantity += product.quantity
+            self._stock_value += product.price * product.quantity
+
+    def _on_product_changed(self, product: Product, field: str, old: Any, new: Any) -> None:
+        """Пересчитывает агрегаты при изменении цены или остатка продукта категории (вызывается под её блокировкой)"""
+        self._version += 1
+        self._snapshot = None
+        if field == "price":
+            self._total_price += new - old
+            self._stock_value += (new - old) * product._quantity
+            self._index.reprice(product, old)
+        elif field == "quantity":
+            self._total_quantity += new - old
+            self._stock_value += product._price * (new - old)
 
     def add_product(self, product: Product) -> None:
         """Добавляет продукт в категорию, только если он экземпляр Product или его наследников"""
         if not isinstance(product, Product):
             raise TypeError("Можно добавлять только объекты класса Product или его наследников")
 
-        self.__products.append(product)
-        Category.product_count += 1
+        started = time.perf_counter() if metrics.enabled else 0.0
+        self.__attach(product)
+        current_registry().products.add(1)
+        if started:
+            metrics.observe("category_add_product", time.perf_counter() - started)
+
+    def remove_product(self, product: Product) -> None:
+        """Удаляет продукт из категории"""
+        self._load()
+        with self._lock:
+            if self not in product._owners:
+                raise ValueError("Продукт не найден в категории")
+            self.__take_out(product)
+            self._index.remove(product)
+            owners = list(product._owners)
+            owners.remove(self)
+            product._owners = tuple(owners)
+            self._version += 1
+            self._snapshot = self._members = None
+            self.quantity -= 1
+            self._total_price -= product.price
+            self._total_quantity -= product.quantity
+            self._stock_value -= product.price * product.quantity
+        current_registry().products.add(-1)
+
+    def __take_out(self, product: Product) -> None:
+        """Убирает одно вхождение продукта из списка за O(1) в среднем (вызывается под блокировкой)"""
+        items = self.__products
+        positions = self.__positions
+        if positions is None:
+            # один проход без интерпретируемого цикла; дыры попадают в карту под id(None) и не мешают
+            positions = self.__positions = dict(zip(map(id, items), range(len(items))))
+        position = positions.pop(id(product))
+        items[position] = None
+        self.__holes += 1
+        if self.__holes * 2 > len(items):
+            self.__products = [item for item in items if item is not None]
+            self.__holes = 0
+            self.__positions = None
+        elif product._owners.count(self) > 1:
+            # продукт входит в категорию несколько раз — запоминаем позицию другого вхождения
+            positions[id(product)] = next(i for i, item in enumerate(items) if item is product)
+
+    def update_product(self, product: Product, price: Optional[float] = None, quantity: Optional[int] = None) -> None:
+        """Меняет цену и/или остаток продукта категории; агрегаты обновляются автоматически"""
+        if self not in product._owners:
+            raise ValueError("Продукт не найден в категории")
+        if price is not None:
+            product.price = price
+        if quantity is not None:
+            product.quantity = quantity
+
+    def snapshot(self) -> CategorySnapshot:
+        """Текущая неизменяемая версия категории.
+
+        Читатель получает без блокировки состав, снятые с продуктов цены и остатки и агрегаты, посчитанные по
+        этим значениям; изменения категории и её продуктов после этого создают новую версию и не затрагивают
+        уже полученную. Сборка версии — один проход по продуктам, он выполняется вне блокировки.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        self._load()
+        with self._lock:
+            if self._members is None:
+                items = self.__products
+                if self.__holes:
+                    self._members = tuple(item for item in items if item is not None)
+                else:
+                    self._members = tuple(cast(List[Product], items))
+            version, members = self._version, self._members
+        # сеттеры продуктов меняют значение до блокировки категории, поэтому агрегаты версии считаются по
+        # снятым значениям, а не берутся из текущих сумм категории
+        prices = tuple(map(_get_price, members))
+        quantities = tuple(map(_get_quantity, members))
+        snapshot = CategorySnapshot(
+            version,
+            members,
+            prices,
+            quantities,
+            sum(prices, 0.0),
+            sum(quantities),
+            sum(map(mul, prices, quantities), 0.0),
+        )
+        with self._lock:
+            if self._version == version:
+                self._snapshot = snapshot  # публикуется, только если категория не изменилась за время сборки
+        return snapshot
+
+    def reprice(self, price: Callable[[Product], float]) -> int:
+        """Массово меняет цены продуктов категории: price(product) возвращает новую цену.
+
+        Агрегаты и индекс цен категории пересчитываются один раз на всю операцию, а подписчики очереди событий
+        (src.events) получают все изменения одним пакетом, а не событием на каждый товар. Возвращает число
+        изменённых цен.
+        """
+        # новые цены считаются до блокировки: функция может читать категорию; повторные вхождения — один товар
+        targets = [(product, price(product)) for product in dict.fromkeys(self.snapshot().products)]
+        changes = []
+        shared = []
+        with self._lock:
+            for product, new in targets:
+                old = product._price
+                owners = product._owners
+                if new == old or self not in owners:
+                    continue
+                if owners.count(self) != len(owners):
+                    shared.append((product, new))
+                    continue
+                product._price = new
+                product._rendered = None
+                # продукт, входящий в категорию несколько раз, учтён в агрегатах за каждое вхождение
+                delta = (new - old) * len(owners)
+                self._total_price += delta
+                self._stock_value += delta * product._quantity
+                changes.append((product, "price", old, new))
+            if changes:
+                self._version += 1
+                self._snapshot = None
+                self._index.reprice_many((product, old) for product, _, old, _ in changes)
+        # товары, входящие и в другие категории, меняются под блокировками всех владельцев, как в сеттере цены
+        for product, new in shared:
+            owners = product._owners
+            with _owner_locks(owners):
+                old = product._price
+                if new != old:
+                    product._price = new
+                    product._rendered = None
+                    for owner in owners:
+                        owner._on_product_changed(product, "price", old, new)
+            if new != old:
+                changes.append((product, "price", old, new))
+        events = Product._events
+        if events is not None:
+            events.put_batch(changes)
+        return len(changes)
 
     @property
     def products(self) -> List[Product]:
-        """Геттер по критериям — возвращает список объектов Product"""
-        return self.__products
+        """Геттер по критериям — возвращает копию списка объектов Product"""
+        return list(self.snapshot().products)
+
+    def iter_products(self) -> Iterator[Product]:
+        """Итератор по продуктам опубликованной версии: параллельные изменения категории его не сдвигают"""
+        return iter(self.snapshot().products)
+
+    def find_by_name(self, name: str) -> List[Product]:
+        """Продукты с точно совпадающим названием"""
+        self._load()
+        return self._index.by_name(name)
+
+    def find_by_price(self, low: float = float("-inf"), high: float = float("inf")) -> List[Product]:
+        """Продукты с ценой в диапазоне [low, high], по возрастанию цены"""
+        self._load()
+        return list(self._index.price_range(low, high))
+
+    def cheapest(self, n: int) -> List[Product]:
+        """n самых дешёвых продуктов категории"""
+        self._load()
+        return self._index.cheapest(n)
+
+    def find_by_attribute(self, attr: str, value: Any) -> List[Product]:
+        """Продукты с заданным значением атрибута наследника (memory, color, country)"""
+        self._load()
+        return self._index.by_attribute(attr, value)
+
+    def query(
+        self,
+        name: Optional[str] = None,
+        low: float = float("-inf"),
+        high: float = float("inf"),
+        **attrs: Any,
+    ) -> List[Product]:
+        """Поиск по нескольким условиям: кандидаты берутся из самого узкого индекса и дофильтровываются.
+
+        Атрибуты без индекса проверяются на кандидатах из индекса названий, атрибутов или цен.
+        """
+        self._load()
+        indexed = [(attr, value) for attr, value in attrs.items() if attr in INDEXED_ATTRIBUTES]
+        if name is not None:
+            candidates = self._index.by_name(name)
+        elif indexed:
+            candidates = self._index.by_attribute(*indexed[0])
+        else:
+            candidates = self.find_by_price(low, high)
+            if not attrs:
+                return candidates
+        return [
+            p
+            for p in candidates
+            if (name is None or p.name == name)
+            and low <= p.price <= high
+            and all(getattr(p, attr, None) == value for attr, value in attrs.items())
+        ]
+
+    def to_arrays(self) -> Dict[str, Any]:
+        """Колонки price, quantity и kind для пакетной аналитики (см. src.analytics)"""
+        return analytics.to_arrays(self.snapshot().products)
+
+    @property
+    def category_count(self) -> int:
+        return current_registry().category_count
+
+    @property
+    def product_count(self) -> int:
+        return current_registry().product_count
+
+    @property
+    def total_price(self) -> float:
+        """Сумма цен всех продуктов категории"""
+        return self._total_price
+
+    @property
+    def total_quantity(self) -> int:
+        """Суммарный остаток всех продуктов категории"""
+        return self._total_quantity
+
+    @property
+    def stock_value(self) -> float:
+        """Суммарная стоимость остатков (цена × количество) всех продуктов категории"""
+        return self._stock_value
 
     def products_str(self) -> str:
         """Возвращает строковое представление всех продуктов"""
-        result = ""
-        for product in self.__products:
-            result += f"{product.name}, {product.price} руб. Остаток: {product.quantity} шт.\n"
-        return result.strip()
+        return self.render_cache.get_or_render(
+            (self._uid, "products"), self._version, lambda: "\n".join(map(str, self.iter_products()))
+        )
+
+    def write_products(self, writer: IO[str]) -> int:
+        """Потоково пишет строки продуктов в writer (файл, StringIO) и возвращает их число"""
+        return CategoryIterator(self).write_to(writer)
 
     def __str__(self) -> str:
         """Возвращает строковое представление категории"""
-        total_quantity = sum(p.quantity for p in self.__products)
-        return f"{self.name}, количество продуктов: {total_quantity} шт."
+        return self.render_cache.get_or_render(
+            (self._uid, "str"),
+            (self._version, self.name),
+            lambda: f"{self.name}, количество продуктов: {self._total_quantity} шт.",
+        )
 
     def middle_price(self) -> float:
         """Возвращает средний ценник всех товаров категории."""
-        try:
-            total: float = 0.0
-            for p in self.products:
-                total += p.price
-            count = len(self.products)
-            return total / count
-        except ZeroDivisionError:
+        if not self.quantity:
             return 0.0
+        return self._total_price / self.quantity
 
 
-class CategoryIterator:
-    def __init__(self, category: Category) -> None:
-        self._products = category.products
-        self._index = 0
-
-    def __iter__(self) -> "CategoryIterator":
-        return self
+class CategoryIterator(Pipeline[Product]):
+    """Итератор по продуктам категории с ленивыми шагами filter, map, take, skip, top_k, chunks"""
 
-    def __next__(self) -> "Product":
-        if self._index < len(self._products):
-            product = self._products[self._index]
-            self._index += 1
-            return product
-        else:
-            raise StopIteration
+    def __init__(self, category: Category) -> None:
+        super().__init__(category.iter_products())
 
 
 class Order(BaseEntity):
     """Класс заказа: один продукт, количество и итоговая стоимость"""
 
     def __init__(self, product: Product, quantity: int):
+        started = time.perf_counter() if metrics.enabled else 0.0
         if quantity > product.quantity:
+            if started:
+                metrics.increment("orders_rejected")
             raise ValueError("Недостаточно товара на складе")
+        if started:
+            metrics.observe("order_validate", time.perf_counter() - started)
+            metrics.increment("orders_created")
         super().__init__(product.name, quantity)
         self.product = product
         self.total_price = product.price * quantity
@@ -0,0 +1,106 @@
+import threading
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from src.ledger import Ledger
+from src.moduls import Order, Product
+
+
+class LineFailure(NamedTuple):
+    """Ошибка в строке пакета заказов: номер строки и причина"""
+
+    line: int
+    reason: str
+
+
+class BatchResult:
+    """Результат пакетного оформления: заказы по строкам, итоговая сумма и ошибки строк"""
+
+    def __init__(self, orders: List[Order], total_price: float, failures: List[LineFailure]) -> None:
+        self.orders = orders
+        self.total_price = total_price
+        self.failures = failures
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+
+class OrderEngine:
+    """Оформляет заказы с атомарным списанием остатка.
+
+    Блокировки распределены по полосам (lock striping): заказы на разные товары почти не ждут друг друга,
+    а проверка остатка и его уменьшение для одного товара выполняются под одной блокировкой.
+    Если задан ledger, каждый оформленный заказ записывается в журнал (см. src.ledger).
+    """
+
+    def __init__(self, stripes: int = 64, ledger: Optional[Ledger] = None) -> None:
+        if stripes < 1:
+            raise ValueError("Количество полос блокировок должно быть не меньше 1")
+        self._locks: List[threading.Lock] = [threading.Lock() for _ in range(stripes)]
+        self.ledger = ledger
+
+    def _stripe(self, product: Product) -> int:
+        # младшие биты id выровнены, поэтому отбрасываем их перед выбором полосы
+        return (id(product) >> 4) % len(self._locks)
+
+    def _lock_for(self, product: Product) -> threading.Lock:
+        return self._locks[self._stripe(product)]
+
+    def place_order(self, product: Product, quantity: int) -> Order:
+        """Создаёт заказ и уменьшает остаток товара; при нехватке остатка выбрасывает ValueError"""
+        if quantity <= 0:
+            raise ValueError("Количество в заказе должно быть положительным")
+        with self._lock_for(product):
+            order = Order(product, quantity)
+            product.quantity -= quantity
+        if self.ledger is not None:
+            self.ledger.append(order)
+        return order
+
+    def place_orders(self, batch: Iterable[Tuple[Product, int]]) -> BatchResult:
+        """Оформляет пакет строк (товар, количество) по принципу «всё или ничего».
+
+        Строки одного товара суммируются, и остаток каждого товара проверяется один раз. Ошибки собираются
+        по всем строкам без исключений; если есть хотя бы одна ошибка, остатки не меняются.
+        """
+        lines = list(batch)
+        failures: List[LineFailure] = []
+        # id товара -> [товар, суммарное количество, номера строк]
+        groups: Dict[int, List[Any]] = {}
+        for number, line in enumerate(lines):
+            try:
+                product, quantity = line
+            except (TypeError, ValueError):
+                failures.append(LineFailure(number, "Строка должна быть парой (товар, количество)"))
+                continue
+            if not isinstance(product, Product):
+                failures.append(LineFailure(number, "Можно заказывать только объекты класса Product"))
+            elif not isinstance(quantity, int) or quantity <= 0:
+                failures.append(LineFailure(number, "Количество в заказе должно быть положительным"))
+            else:
+                group = groups.setdefault(id(product), [product, 0, []])
+                group[1] += quantity
+                group[2].append(number)
+
+        # полосы захватываются в порядке номеров, чтобы пакеты не блокировали друг друга взаимно
+        stripes = sorted({self._stripe(group[0]) for group in groups.values()})
+        for stripe in stripes:
+            self._locks[stripe].acquire()
+        try:
+            for product, quantity, numbers in groups.values():
+                if quantity > product.quantity:
+                    failures.extend(LineFailure(number, "Недостаточно товара на складе") for number in numbers)
+            if failures:
+                failures.sort()
+                return BatchResult([], 0.0, failures)
+
+            total_price = sum(product.price * quantity for product, quantity, _ in groups.values())
+            orders = [Order(product, quantity) for product, quantity in lines]
+            for product, quantity, _ in groups.values():
+                product.quantity -= quantity
+        finally:
+            for stripe in reversed(stripes):
+                self._locks[stripe].release()
+        if self.ledger is not None:
+            self.ledger.extend(orders)
+        return BatchResult(orders, total_price, [])
@@ -0,0 +1,75 @@
+import heapq
+from itertools import islice
+from typing import IO, Any, Callable, Generic, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class Pipeline(Generic[T]):
+    """Ленивый конвейер над последовательностью продуктов: шаги выполняются только при итерации"""
+
+    def __init__(self, source: Iterable[T]) -> None:
+        self._source: Iterator[T] = iter(source)
+
+    def __iter__(self) -> Iterator[T]:
+        return self
+
+    def __next__(self) -> T:
+        return next(self._source)
+
+    def filter(self, predicate: Callable[[T], bool]) -> "Pipeline[T]":
+        return Pipeline(filter(predicate, self))
+
+    def map(self, func: Callable[[T], R]) -> "Pipeline[R]":
+        return Pipeline(map(func, self))
+
+    def skip(self, n: int) -> "Pipeline[T]":
+        return Pipeline(islice(self, n, None))
+
+    def take(self, n: int) -> "Pipeline[T]":
+        return Pipeline(islice(self, n))
+
+    def sorted_by(self, key: Callable[[T], Any], reverse: bool = False) -> "Pipeline[T]":
+        """Полная сортировка: все элементы читаются при первом next(), а не при построении шага"""
+
+        def generate() -> Iterator[T]:
+            yield from sorted(self, key=key, reverse=reverse)
+
+        return Pipeline(generate())
+
+    def top_k(self, k: int, key: Callable[[T], Any], largest: bool = False) -> "Pipeline[T]":
+        """k наименьших (или наибольших) элементов через кучу: O(n log k) времени и O(k) памяти.
+
+        Как и sorted_by, источник читается при первом next().
+        """
+        select = heapq.nlargest if largest else heapq.nsmallest
+
+        def generate() -> Iterator[T]:
+            yield from select(k, self, key=key)
+
+        return Pipeline(generate())
+
+    def chunks(self, size: int) -> "Pipeline[List[T]]":
+        """Группирует элементы в списки по size штук"""
+        if size < 1:
+            raise ValueError("Размер пачки должен быть не меньше 1")
+
+        def generate() -> Iterator[List[T]]:
+            while True:
+                chunk = list(islice(self, size))
+                if not chunk:
+                    return
+                yield chunk
+
+        return Pipeline(generate())
+
+    def write_to(self, writer: IO[str], render: Optional[Callable[[T], str]] = None) -> int:
+        """Построчно пишет элементы в writer и возвращает число строк"""
+        render = render or str
+        count = 0
+        for item in self:
+            writer.write(render(item))
+            writer.write("\n")
+            count += 1
+        return count
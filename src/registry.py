@@ -0,0 +1,85 @@
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+
+class StripedCounter:
+    """Счётчик без общей блокировки: каждый поток увеличивает свою ячейку, значения складываются при чтении"""
+
+    def __init__(self, value: int = 0) -> None:
+        self._base = value
+        self._cells: List[List[int]] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()  # нужна только при регистрации новой ячейки и при сбросе
+
+    def _cell(self) -> List[int]:
+        try:
+            return self._local.cell  # type: ignore[no-any-return]
+        except AttributeError:
+            cell = [0]
+            with self._lock:
+                self._cells.append(cell)
+            self._local.cell = cell
+            return cell
+
+    def add(self, amount: int = 1) -> None:
+        # в ячейку пишет только поток-владелец, поэтому обновления не теряются
+        self._cell()[0] += amount
+
+    @property
+    def value(self) -> int:
+        return self._base + sum(cell[0] for cell in list(self._cells))
+
+    def set(self, value: int) -> None:
+        """Устанавливает значение счётчика (например, сброс в тестах)"""
+        with self._lock:
+            for cell in self._cells:
+                cell[0] = 0
+            self._base = value
+
+
+class CatalogRegistry:
+    """Реестр каталога: владеет счётчиками категорий и товаров"""
+
+    def __init__(self) -> None:
+        self.categories = StripedCounter()
+        self.products = StripedCounter()
+
+    @property
+    def category_count(self) -> int:
+        return self.categories.value
+
+    @property
+    def product_count(self) -> int:
+        return self.products.value
+
+    def reset(self) -> None:
+        self.categories.set(0)
+        self.products.set(0)
+
+    def snapshot(self) -> Dict[str, int]:
+        return {"category_count": self.category_count, "product_count": self.product_count}
+
+
+default_registry = CatalogRegistry()
+_current: ContextVar[CatalogRegistry] = ContextVar("catalog_registry", default=default_registry)
+
+
+def current_registry() -> CatalogRegistry:
+    """Реестр, действующий в текущем контексте (по умолчанию — общий default_registry)"""
+    return _current.get()
+
+
+@contextmanager
+def use_registry(registry: Optional[CatalogRegistry] = None) -> Iterator[CatalogRegistry]:
+    """Делает реестр текущим внутри блока; без аргумента создаёт новый изолированный реестр.
+
+    Контекст не передаётся в потоки пула автоматически, поэтому воркеру нужно войти в блок самому.
+    """
+    registry = registry if registry is not None else CatalogRegistry()
+    token = _current.set(registry)
+    try:
+        yield registry
+    finally:
+        _current.reset(token)
@@ -0,0 +1,45 @@
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Tuple
+
+
+class RenderCache:
+    """Ограниченный LRU-кеш строкового представления категорий со счётчиками попаданий и промахов.
+
+    По ключу хранится одна строка вместе с версией, для которой она построена: другая версия — промах,
+    и новая строка заменяет старую, поэтому категория занимает не больше одной записи на каждое представление.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        if maxsize < 1:
+            raise ValueError("Размер кеша должен быть не меньше 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Tuple[Hashable, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key: Hashable, version: Hashable, render: Callable[[], str]) -> str:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] == version:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        value = render()
+        with self._lock:
+            self._data[key] = (version, value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Счётчики для экспорта в мониторинг"""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "maxsize": self.maxsize}
@@ -0,0 +1,86 @@
+import itertools
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from src.moduls import LawnGrass, Product, Smartphone
+
+NUMBER = (int, float)
+
+# схемы полей: допустимые типы значения в порядке _fields класса
+FIELD_TYPES: Dict[str, Tuple[type, ...]] = {
+    "name": (str,),
+    "description": (str,),
+    "price": NUMBER,
+    "quantity": (int,),
+    "efficiency": NUMBER,
+    "model": (str,),
+    "memory": (int,),
+    "color": (str,),
+    "country": (str,),
+    "germination_period": (str,),
+}
+
+# значение поля "type" в записи продукта -> класс; без тега создаётся Product
+TYPE_TAGS: Dict[str, Type[Product]] = {
+    "product": Product,
+    "smartphone": Smartphone,
+    "lawn_grass": LawnGrass,
+}
+
+Validator = Callable[[Dict[str, Any]], Tuple[Any, ...]]
+
+
+class LoadReport:
+    """Отчёт загрузки: число загруженных записей и ошибки с указанием места"""
+
+    def __init__(self) -> None:
+        self.loaded = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    @property
+    def rejected(self) -> int:
+        return len(self.errors)
+
+    def add_error(self, category: int, product: Optional[int], message: str) -> None:
+        self.errors.append({"category": category, "product": product, "error": message})
+
+
+def compile_schema(cls: Type[Product], allow_sold_out: bool = False) -> Validator:
+    """Готовит проверку записей одного класса.
+
+    Поля достаются одним itemgetter, а типы сверяются одной проверкой кортежа типов по множеству допустимых
+    сигнатур; разбор по полям выполняется только для сообщения об ошибке. allow_sold_out разрешает нулевой
+    остаток — для каталогов, сохранённых после продаж.
+    """
+    min_quantity = 0 if allow_sold_out else 1
+    fields = cls._fields
+    getter = itemgetter(*fields)
+    checks = tuple((field, FIELD_TYPES[field]) for field in fields)
+    # bool — подкласс int, но ценой или количеством быть не может, поэтому типы сравниваются точно
+    signatures = frozenset(itertools.product(*(types for _, types in checks)))
+
+    def validate(record: Dict[str, Any]) -> Tuple[Any, ...]:
+        try:
+            values = getter(record)
+        except KeyError as error:
+            raise ValueError(f"нет поля {error.args[0]}") from None
+        if tuple(map(type, values)) not in signatures:
+            for (field, types), value in zip(checks, values):
+                if type(value) not in types:
+                    raise ValueError(f"поле {field}: ожидался {'/'.join(t.__name__ for t in types)}")
+        if values[2] < 0:
+            raise ValueError("поле price: цена не может быть отрицательной")
+        if values[3] < min_quantity:
+            if allow_sold_out:
+                raise ValueError("поле quantity: количество не может быть отрицательным")
+            raise ValueError("поле quantity: количество должно быть положительным")
+        return values  # type: ignore[no-any-return]
+
+    return validate
+
+
+SCHEMAS: Dict[Type[Product], Validator] = {cls: compile_schema(cls) for cls in TYPE_TAGS.values()}
+# проверки для сохранённых каталогов, где товар мог быть распродан
+SOLD_OUT_SCHEMAS: Dict[Type[Product], Validator] = {
+    cls: compile_schema(cls, allow_sold_out=True) for cls in TYPE_TAGS.values()
+}
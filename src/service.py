@@ -0,0 +1,155 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import unquote_plus
+
+from src.codec import get_backend
+from src.data_loader import iter_categories_from_json
+from src.moduls import Category, Order, Product
+from src.orders import OrderEngine
+
+_END = object()
+_JSON = get_backend()
+
+
+async def aiter_categories_from_json(filepath: str) -> AsyncIterator[Category]:
+    """Асинхронно выдаёт категории из файла: чтение и разбор идут в потоке, не блокируя цикл событий"""
+    iterator = iter_categories_from_json(filepath)
+    while True:
+        category = await asyncio.to_thread(next, iterator, _END)
+        if category is _END:
+            return
+        yield category  # type: ignore[misc]
+
+
+async def async_load_categories(filepath: str) -> List[Category]:
+    return [category async for category in aiter_categories_from_json(filepath)]
+
+
+class AsyncOrderQueue:
+    """Асинхронная очередь заказов: изменения остатка одного товара выполняются строго по очереди.
+
+    Заказы на товар ждут своей очереди на asyncio.Lock в цикле событий (блокировка отдаётся в порядке прихода),
+    и в поток (asyncio.to_thread) уходит только текущий заказ товара: всплеск заказов на один товар не занимает
+    потоки исполнителя, а заказы на разные товары не ждут друг друга. Запись в журнал заказов и его снимки не
+    блокируют цикл событий. Списание идёт через OrderEngine, так что очередь безопасно сочетается с синхронными
+    потоками, оформляющими заказы напрямую. Блокировка товара удаляется, когда его заказов не остаётся.
+    """
+
+    def __init__(self, engine: Optional[OrderEngine] = None) -> None:
+        self.engine = engine or OrderEngine()
+        # id товара -> блокировка и число заказов, которые её ждут или держат
+        self._locks: Dict[int, List[Any]] = {}
+
+    async def submit(self, product: Product, quantity: int) -> Order:
+        key = id(product)
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                return await asyncio.to_thread(self.engine.place_order, product, quantity)
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._locks[key]
+
+
+class CatalogService:
+    """Небольшой HTTP/JSON-сервис каталога на asyncio.
+
+    GET /categories — список категорий с агрегатами;
+    GET /products?category=<название> — товары категории;
+    POST /orders с телом {"category": ..., "product": ..., "quantity": ...} — оформление заказа.
+    """
+
+    def __init__(self, categories: List[Category], orders: Optional[AsyncOrderQueue] = None) -> None:
+        self.categories = {category.name: category for category in categories}
+        self.orders = orders or AsyncOrderQueue()
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> Tuple[str, int]:
+        """Запускает сервер и возвращает фактический адрес (port=0 — свободный порт)"""
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        address = self._server.sockets[0].getsockname()
+        return address[0], address[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else b""
+
+                status, payload = await self.dispatch(method, target, body)
+                data = _JSON.dumps(payload)
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> Tuple[str, Any]:
+        """Обрабатывает запрос и возвращает статус и JSON-совместимый ответ"""
+        path, _, query = target.partition("?")
+        if method == "GET" and path == "/categories":
+            return "200 OK", [
+                {
+                    "name": category.name,
+                    "description": category.description,
+                    "products": category.quantity,
+                    "total_quantity": category.total_quantity,
+                    "middle_price": category.middle_price(),
+                }
+                for category in self.categories.values()
+            ]
+        if method == "GET" and path == "/products":
+            params = dict(part.partition("=")[::2] for part in query.split("&") if part)
+            category = self.categories.get(unquote_plus(params.get("category", "")))
+            if category is None:
+                return "404 Not Found", {"error": "Категория не найдена"}
+            return "200 OK", [
+                {"name": p.name, "price": p.price, "quantity": p.quantity} for p in category.iter_products()
+            ]
+        if method == "POST" and path == "/orders":
+            try:
+                request = _JSON.loads(body)
+                category_name, product_name, quantity = request["category"], request["product"], request["quantity"]
+            except (KeyError, TypeError, _JSON.decode_error):
+                return "400 Bad Request", {"error": "Ожидается JSON с полями category, product и quantity"}
+            if not isinstance(category_name, str) or not isinstance(product_name, str):
+                return "400 Bad Request", {"error": "Поля category и product должны быть строками"}
+            if not isinstance(quantity, int) or isinstance(quantity, bool) or quantity <= 0:
+                return "400 Bad Request", {"error": "Количество должно быть целым положительным числом"}
+            category = self.categories.get(category_name)
+            found = category.find_by_name(product_name) if category is not None else []
+            if not found:
+                return "404 Not Found", {"error": "Товар не найден"}
+            try:
+                order = await self.orders.submit(found[0], quantity)
+            except ValueError as error:
+                return "409 Conflict", {"error": str(error)}
+            return "201 Created", {"product": order.name, "quantity": order.quantity, "total_price": order.total_price}
+        return "404 Not Found", {"error": "Неизвестный адрес"}
@@ -0,0 +1,153 @@
+import struct
+from multiprocessing import resource_tracker, shared_memory
+from typing import List, Optional, Sequence
+
+from src.moduls import Category
+from src.snapshot import SnapshotReader, snapshot_bytes
+
+# управляющий блок хранит только номер поколения; снимок лежит в блоке "<имя>_<поколение>" после заголовка
+# с его размером — размер и данные меняются вместе с блоком, поэтому читатель не увидит новый номер со старым размером
+_CONTROL = struct.Struct("<Q")
+_BLOCK_HEADER = struct.Struct("<Q")
+
+
+def _buffer(block: shared_memory.SharedMemory) -> memoryview:
+    """Буфер блока; None он бывает только после close()"""
+    buf = block.buf
+    assert buf is not None
+    return buf
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Подключается к существующему блоку, не передавая его трекеру ресурсов процесса.
+
+    Иначе трекер удалит блок при завершении процесса-читателя, хотя им владеет издатель.
+    """
+    try:
+        return shared_memory.SharedMemory(name, track=False)  # type: ignore[call-arg]
+    except TypeError:  # Python < 3.13: регистрация на время подключения отключается
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None  # type: ignore[assignment]
+        try:
+            return shared_memory.SharedMemory(name)
+        finally:
+            resource_tracker.register = register
+
+
+class CatalogPublisher:
+    """Публикует каталог в общую память для процессов-читателей (см. CatalogCache).
+
+    Каждая публикация — новый блок со снимком в формате src.snapshot и увеличение номера поколения
+    в управляющем блоке. Блок предыдущего поколения удаляется из пространства имён сразу, а освобождается,
+    когда от него отключится последний читатель.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.generation = 0
+        self._control = shared_memory.SharedMemory(name, create=True, size=_CONTROL.size)
+        _CONTROL.pack_into(_buffer(self._control), 0, 0)
+        self._block: Optional[shared_memory.SharedMemory] = None
+
+    def publish(self, categories: Sequence[Category]) -> int:
+        """Публикует снимок категорий и возвращает номер нового поколения"""
+        data = snapshot_bytes(categories)
+        generation = self.generation + 1
+        size = _BLOCK_HEADER.size + len(data)
+        block = shared_memory.SharedMemory(f"{self.name}_{generation}", create=True, size=size)
+        buf = _buffer(block)
+        _BLOCK_HEADER.pack_into(buf, 0, len(data))
+        buf[_BLOCK_HEADER.size : size] = data
+        _CONTROL.pack_into(_buffer(self._control), 0, generation)
+        self._retire()
+        self._block, self.generation = block, generation
+        return generation
+
+    def _retire(self) -> None:
+        if self._block is not None:
+            self._block.close()
+            self._block.unlink()
+            self._block = None
+
+    def close(self) -> None:
+        """Удаляет блоки каталога; подключённые читатели сохраняют доступ к уже открытым снимкам"""
+        self._retire()
+        self._control.close()
+        self._control.unlink()
+
+    def __enter__(self) -> "CatalogPublisher":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class CatalogCache:
+    """Каталог из общей памяти в процессе-читателе.
+
+    Колонки и строки не копируются: категории из categories() — те же отложенные категории, что и у
+    load_snapshot, продукты создаются только для категорий, к продуктам которых обратились. refresh()
+    подхватывает новое поколение без перезапуска процесса.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.generation = 0
+        self._control = _attach(name)
+        self._block: Optional[shared_memory.SharedMemory] = None
+        self._categories: List[Category] = []
+        # блоки прошлых поколений, на которые ещё ссылаются категории (закрываются при следующем refresh)
+        self._retired: List[shared_memory.SharedMemory] = []
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """Подключается к новому поколению, если оно опубликовано; возвращает True, если каталог обновился"""
+        self._close_retired()
+        missing = None
+        while True:
+            (generation,) = _CONTROL.unpack_from(_buffer(self._control), 0)
+            if generation == self.generation:
+                return False
+            try:
+                block = _attach(f"{self.name}_{generation}")
+            except FileNotFoundError:
+                if generation == missing:
+                    raise  # номер не меняется — издатель закрыт
+                missing = generation  # издатель успел опубликовать следующее поколение — перечитываем номер
+                continue
+            break
+        buf = _buffer(block)
+        (size,) = _BLOCK_HEADER.unpack_from(buf, 0)
+        reader = SnapshotReader(buf[_BLOCK_HEADER.size : _BLOCK_HEADER.size + size].toreadonly())
+        self._categories = reader.categories()
+        if self._block is not None:
+            self._retired.append(self._block)
+        self._block, self.generation = block, generation
+        return True
+
+    def categories(self) -> List[Category]:
+        """Категории текущего поколения"""
+        return list(self._categories)
+
+    def _close_retired(self) -> None:
+        alive = []
+        for block in self._retired:
+            try:
+                block.close()
+            except BufferError:  # категории старого поколения ещё используются
+                alive.append(block)
+        self._retired = alive
+
+    def close(self) -> None:
+        self._categories = []
+        if self._block is not None:
+            self._retired.append(self._block)
+            self._block = None
+        self._close_retired()
+        self._control.close()
+
+    def __enter__(self) -> "CatalogCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,190 @@
+import json
+import mmap
+import struct
+import sys
+from array import array
+from functools import partial
+from typing import Any, Dict, List, Sequence, Tuple, Type
+
+from src.moduls import Category, LawnGrass, Product, Smartphone, build_products
+
+# Формат снимка (little-endian, все секции выровнены по 8 байт):
+#   заголовок: магическая строка, версия, число категорий, продуктов и строк
+#   таблица категорий: id названия и описания, первый продукт, число продуктов и агрегаты
+#   колонки продуктов: price (float64), quantity (int64), id названия, описания и доп. полей (uint32), класс (uint8)
+#   таблица строк: смещения (uint64) и UTF-8 данные
+MAGIC = b"CATSNAP1"
+VERSION = 1
+_HEADER = struct.Struct("<8sIIQQ")
+_CATEGORY = struct.Struct("<IIQQdqd")
+NO_EXTRA = 0xFFFFFFFF
+KINDS: Tuple[Type[Product], ...] = (Product, Smartphone, LawnGrass)
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _check_byteorder() -> None:
+    if sys.byteorder != "little":
+        raise RuntimeError("Снимки каталога поддерживаются только на little-endian платформах")
+
+
+class _StringTable:
+    """Таблица строк снимка: одинаковые строки хранятся один раз"""
+
+    def __init__(self) -> None:
+        self.ids: Dict[str, int] = {}
+        self.data: List[bytes] = []
+
+    def add(self, value: str) -> int:
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = self.ids[value] = len(self.data)
+            self.data.append(value.encode("utf-8"))
+        return string_id
+
+
+def snapshot_bytes(categories: Sequence[Category]) -> bytes:
+    """Сериализует категории в бинарный снимок"""
+    _check_byteorder()
+    strings = _StringTable()
+    category_table = bytearray()
+    prices, quantities = array("d"), array("q")
+    name_ids, description_ids, extra_ids = array("I"), array("I"), array("I")
+    kinds = array("B")
+
+    for category in categories:
+        products = category.products
+        category_table += _CATEGORY.pack(
+            strings.add(category.name),
+            strings.add(category.description),
+            len(prices),
+            len(products),
+            category.total_price,
+            category.total_quantity,
+            category.stock_value,
+        )
+        for product in products:
+            kind = type(product)
+            if kind not in KINDS:
+                raise TypeError(f"Класс {kind.__name__} не поддерживается форматом снимка")
+            prices.append(product.price)
+            quantities.append(product.quantity)
+            name_ids.append(strings.add(product.name))
+            description_ids.append(strings.add(product.description))
+            extra = [getattr(product, field) for field in kind._fields[len(Product._fields) :]]
+            extra_ids.append(strings.add(json.dumps(extra, ensure_ascii=False)) if extra else NO_EXTRA)
+            kinds.append(KINDS.index(kind))
+
+    offsets = array("Q", [0])
+    for data in strings.data:
+        offsets.append(offsets[-1] + len(data))
+
+    parts = [
+        _HEADER.pack(MAGIC, VERSION, len(categories), len(prices), len(strings.data)),
+        bytes(category_table),
+        prices.tobytes(),
+        quantities.tobytes(),
+        name_ids.tobytes(),
+        description_ids.tobytes(),
+        extra_ids.tobytes(),
+        kinds.tobytes(),
+    ]
+    size = sum(map(len, parts))
+    parts.append(b"\0" * (_align(size) - size))
+    parts.append(offsets.tobytes())
+    parts.extend(strings.data)
+    return b"".join(parts)
+
+
+def write_snapshot(categories: Sequence[Category], filepath: str) -> None:
+    """Записывает категории в файл бинарного снимка"""
+    with open(filepath, "wb") as file:
+        file.write(snapshot_bytes(categories))
+
+
+class SnapshotReader:
+    """Читает снимок из любого буфера (mmap, shared memory) без копирования колонок.
+
+    Продукты создаются только при первом обращении к продуктам категории.
+    """
+
+    def __init__(self, buffer: Any) -> None:
+        _check_byteorder()
+        view = memoryview(buffer).cast("B")
+        magic, version, n_categories, n_products, n_strings = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Файл не является снимком каталога поддерживаемой версии")
+        self._view = view
+        self.category_count = n_categories
+        self.product_count = n_products
+
+        offset = _HEADER.size
+        self._categories_offset = offset
+        offset += n_categories * _CATEGORY.size
+        self.prices = view[offset : offset + 8 * n_products].cast("d")
+        offset += 8 * n_products
+        self.quantities = view[offset : offset + 8 * n_products].cast("q")
+        offset += 8 * n_products
+        self._name_ids = view[offset : offset + 4 * n_products].cast("I")
+        offset += 4 * n_products
+        self._description_ids = view[offset : offset + 4 * n_products].cast("I")
+        offset += 4 * n_products
+        self._extra_ids = view[offset : offset + 4 * n_products].cast("I")
+        offset += 4 * n_products
+        self._kinds = view[offset : offset + n_products]
+        offset = _align(offset + n_products)
+        self._string_offsets = view[offset : offset + 8 * (n_strings + 1)].cast("Q")
+        self._string_data = view[offset + 8 * (n_strings + 1) :]
+        self._strings: Dict[int, str] = {}
+
+    def string(self, string_id: int) -> str:
+        value = self._strings.get(string_id)
+        if value is None:
+            start, end = self._string_offsets[string_id], self._string_offsets[string_id + 1]
+            value = self._strings[string_id] = str(self._string_data[start:end], "utf-8")
+        return value
+
+    def record(self, i: int) -> Tuple[Any, ...]:
+        """Поля продукта с номером i в порядке _fields его класса"""
+        record: Tuple[Any, ...] = (
+            self.string(self._name_ids[i]),
+            self.string(self._description_ids[i]),
+            self.prices[i],
+            self.quantities[i],
+        )
+        extra_id = self._extra_ids[i]
+        if extra_id != NO_EXTRA:
+            record += tuple(json.loads(self.string(extra_id)))
+        return record
+
+    def products(self, first: int, count: int) -> List[Product]:
+        """Создаёт продукты с номерами [first, first + count)"""
+        kinds = self._kinds
+        return build_products(((KINDS[kinds[i]], self.record(i)) for i in range(first, first + count)), validate=False)
+
+    def categories(self) -> List[Category]:
+        """Категории снимка с отложенной загрузкой продуктов"""
+        result = []
+        for i in range(self.category_count):
+            name_id, description_id, first, count, total_price, total_quantity, stock_value = _CATEGORY.unpack_from(
+                self._view, self._categories_offset + i * _CATEGORY.size
+            )
+            result.append(
+                Category.deferred(
+                    self.string(name_id),
+                    self.string(description_id),
+                    count,
+                    (total_price, total_quantity, stock_value),
+                    partial(self.products, first, count),
+                )
+            )
+        return result
+
+
+def load_snapshot(filepath: str) -> List[Category]:
+    """Открывает снимок через mmap и возвращает категории с отложенной загрузкой продуктов"""
+    with open(filepath, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return SnapshotReader(mapped).categories()
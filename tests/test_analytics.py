@@ -0,0 +1,60 @@
+import pytest
+
+from src import analytics
+from src.moduls import Category, LawnGrass, Product, Smartphone
+
+
+@pytest.fixture
+def category() -> Category:
+    return Category(
+        "Разное",
+        "Описание",
+        [
+            Smartphone("Iphone 15", "512GB", 210000.0, 8, 98.2, "15", 512, "Gray"),
+            Smartphone("Xiaomi", "1024GB", 31000.0, 14, 90.3, "Note 11", 1024, "Синий"),
+            LawnGrass("Газон", "Трава", 500.0, 20, "Россия", "7 дней", "Зеленый"),
+            Product("Чехол", "Кожа", 1500.0, 3),
+        ],
+    )
+
+
+def test_totals_fallback(category: Category) -> None:
+    result = analytics.totals(category, use_numpy=False)
+    assert result["count"] == 4
+    assert result["total_quantity"] == category.total_quantity
+    assert result["stock_value"] == category.stock_value
+    assert result["mean_price"] == category.middle_price()
+    assert list(category.to_arrays()["quantity"]) == [8, 14, 20, 3]
+
+
+def test_percentiles_fallback(category: Category) -> None:
+    assert analytics.percentiles(category, [0, 50, 100], use_numpy=False) == [500.0, 16250.0, 210000.0]
+    assert analytics.percentiles([], [50], use_numpy=False) == [0.0]
+
+
+def test_group_by_class_fallback(category: Category) -> None:
+    groups = analytics.group_by_class(category, use_numpy=False)
+    assert list(groups) == ["LawnGrass", "Product", "Smartphone"]
+    assert groups["Smartphone"] == {
+        "count": 2,
+        "total_quantity": 22,
+        "stock_value": 210000.0 * 8 + 31000.0 * 14,
+        "mean_price": (210000.0 + 31000.0) / 2,
+    }
+
+
+def test_pair_stock_values_matches_add(category: Category) -> None:
+    phones = category.find_by_attribute("color", "Gray") + category.find_by_attribute("color", "Синий")
+    pairs = [(phones[0], phones[1])]
+    assert analytics.pair_stock_values(pairs, use_numpy=False) == [phones[0] + phones[1]]
+    with pytest.raises(TypeError):
+        analytics.pair_stock_values([(phones[0], category.find_by_name("Газон")[0])], use_numpy=False)
+
+
+def test_numpy_matches_fallback(category: Category) -> None:
+    pytest.importorskip("numpy")
+    assert analytics.totals(category) == pytest.approx(analytics.totals(category, use_numpy=False))
+    assert analytics.percentiles(category, [10, 90]) == pytest.approx(
+        analytics.percentiles(category, [10, 90], use_numpy=False)
+    )
+    assert analytics.group_by_class(category) == analytics.group_by_class(category, use_numpy=False)
@@ -0,0 +1,14 @@
+from benchmarks.suite import CASES, compare, run_case
+
+
+def test_run_case_reports_metrics() -> None:
+    row = run_case(CASES["middle_price"], 10, repeats=2)
+    assert set(row) == {"throughput", "p50_ms", "max_ms", "peak_mb"}
+    assert row["throughput"] > 0
+
+
+def test_compare_detects_regressions() -> None:
+    baseline = {"case@1": {"throughput": 1000.0, "peak_mb": 10.0}}
+    assert compare({"case@1": {"throughput": 900.0, "peak_mb": 10.5}}, baseline, 0.2) == []
+    assert len(compare({"case@1": {"throughput": 700.0, "peak_mb": 20.0}}, baseline, 0.2)) == 2
+    assert compare({"other@1": {"throughput": 1.0, "peak_mb": 99.0}}, baseline, 0.2) == []
@@ -0,0 +1,111 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from benchmarks.startup import imported_modules, parse_importtime
+from src.cli import main
+from src.registry import use_registry
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def snapshot(tmp_path: Path) -> str:
+    path = str(tmp_path / "catalog.snap")
+    with use_registry():
+        assert main(["load", str(ROOT / "data" / "products.json"), "-o", path]) == 0
+    return path
+
+
+def test_stats_from_snapshot(snapshot: str, capsys: pytest.CaptureFixture) -> None:
+    capsys.readouterr()
+    with use_registry():
+        assert main(["stats", snapshot, "--json"]) == 0
+    rows = json.loads(capsys.readouterr().out)
+    assert [row["name"] for row in rows] == ["Смартфоны", "Телевизоры"]
+    assert rows[0]["products"] == 3 and rows[0]["total_quantity"] == 27
+
+
+def test_query_and_order(snapshot: str, tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    capsys.readouterr()
+    with use_registry():
+        assert main(["query", snapshot, "--max-price", "100000"]) == 0
+        assert capsys.readouterr().out.startswith("Смартфоны: Xiaomi Redmi Note 11")
+
+        args = ["order", snapshot, "--category", "Смартфоны", "--product", "Iphone 15", "--quantity", "2"]
+        assert main([*args, "--save", "--ledger", str(tmp_path / "ledger")]) == 0
+        assert "итого: 420000.0" in capsys.readouterr().out
+        assert main(["query", snapshot, "--name", "Iphone 15"]) == 0
+        assert "Остаток: 6 шт." in capsys.readouterr().out
+
+        assert main([*args[:-1], "100"]) == 1
+        assert "Недостаточно товара" in capsys.readouterr().err
+        assert main(["stats", str(tmp_path / "нет.snap")]) == 1
+
+
+def test_export_round_trip(snapshot: str, tmp_path: Path) -> None:
+    output = tmp_path / "catalog.json"
+    with use_registry():
+        assert main(["export", snapshot, str(output), "--backend", "json"]) == 0
+    data = json.loads(output.read_text(encoding="utf-8"))
+    assert [c["name"] for c in data] == ["Смартфоны", "Телевизоры"] and data[0]["products"][0]["type"] == "product"
+
+
+def test_order_saves_json_catalog(tmp_path: Path) -> None:
+    path = tmp_path / "products.json"
+    shutil.copy(ROOT / "data" / "products.json", path)
+    with use_registry():
+        args = ["order", str(path), "--category", "Телевизоры", "--product", '55" QLED 4K', "--quantity", "1"]
+        assert main([*args, "--save"]) == 0
+    assert json.loads(path.read_text(encoding="utf-8"))[1]["products"][0]["quantity"] == 6
+
+
+def test_sold_out_product_survives_json_save(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    """Распроданный товар сохраняется с остатком 0 и не пропадает при следующих загрузке и сохранении"""
+    path = tmp_path / "products.json"
+    shutil.copy(ROOT / "data" / "products.json", path)
+    args = ["order", str(path), "--category", "Телевизоры", "--product", '55" QLED 4K', "--save"]
+    with use_registry():
+        assert main([*args, "--quantity", "7"]) == 0
+        assert main([*args, "--quantity", "1"]) == 1
+        assert "Недостаточно товара" in capsys.readouterr().err
+        phone = ["--category", "Смартфоны", "--product", "Iphone 15", "--quantity", "1", "--save"]
+        assert main(["order", str(path), *phone]) == 0
+    products = json.loads(path.read_text(encoding="utf-8"))[1]["products"]
+    assert [(p["name"], p["quantity"]) for p in products] == [('55" QLED 4K', 0)]
+
+
+def test_save_refuses_to_drop_rejected_records(tmp_path: Path, capsys: pytest.CaptureFixture) -> None:
+    path = tmp_path / "products.json"
+    data = json.loads((ROOT / "data" / "products.json").read_text(encoding="utf-8"))
+    data[0]["products"][0]["price"] = "дорого"
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    before = path.read_bytes()
+    with use_registry():
+        args = ["order", str(path), "--category", "Смартфоны", "--product", "Iphone 15", "--quantity", "1"]
+        assert main([*args, "--save"]) == 1
+    assert "--save удалил бы их" in capsys.readouterr().err
+    assert path.read_bytes() == before
+
+
+def test_query_by_non_indexed_attribute(snapshot: str, capsys: pytest.CaptureFixture) -> None:
+    capsys.readouterr()
+    with use_registry():
+        assert main(["query", snapshot, "--attr", "model=15"]) == 0
+        assert main(["query", snapshot, "--attr", "model=15", "--min-price", "100000"]) == 0
+    assert capsys.readouterr() == ("", "")
+
+
+def test_stats_does_not_import_heavy_modules(snapshot: str) -> None:
+    """Короткая команда над снимком не тянет пул процессов, asyncio, профилировщики и numpy"""
+    modules = imported_modules(snapshot)
+    assert "src.snapshot" in modules
+    for heavy in ("numpy", "asyncio", "concurrent.futures", "multiprocessing", "cProfile", "src.data_loader"):
+        assert heavy not in modules
+
+
+def test_parse_importtime() -> None:
+    stderr = "import time: self [us] | cumulative | imported package\nimport time:       120 |        300 |   json\n"
+    assert parse_importtime(stderr) == {"json": (120, 300)}
@@ -0,0 +1,74 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from src import codec
+from src.data_loader import load_catalog
+from src.moduls import Category, LawnGrass, Product, Smartphone
+from src.registry import use_registry
+
+
+@pytest.fixture
+def categories() -> list:
+    phones = Category(
+        "Смартфоны",
+        "Описание",
+        [
+            Smartphone("Iphone 15", "512GB", 210000.0, 8, 98.2, "15", 512, "Gray"),
+            Product("Чехол", "Силикон", 1500.0, 3),
+        ],
+    )
+    grass = Category("Газон", "Трава", [LawnGrass("Газон", "Трава", 500.0, 20, "Россия", "7 дней", "Зеленый")])
+    phones.products[1].quantity = 0  # распроданный товар тоже должен переживать запись и чтение
+    return [phones, grass, Category("Пустая", "Без товаров")]
+
+
+def fields(categories: list) -> list:
+    return [
+        (c.name, c.description, [(type(p), [getattr(p, f) for f in p._fields]) for p in c.products])
+        for c in categories
+    ]
+
+
+@pytest.mark.parametrize("backend", list(codec.BACKENDS))
+def test_round_trip(categories: list, backend: str) -> None:
+    with use_registry():
+        data = codec.dumps(categories, codec.get_backend(backend))
+        assert fields(codec.loads(data, codec.get_backend(backend))) == fields(categories)
+    assert json.loads(data)[0]["products"][0]["type"] == "smartphone"
+
+
+def test_streaming_encode_is_valid_json(categories: list) -> None:
+    """Продукты кодируются пачками, но результат — один корректный JSON-документ"""
+    parts = list(codec.iter_encode(categories, codec.get_backend("json"), chunk_size=1))
+    assert len(parts) > len(categories) + 2
+    assert json.loads(b"".join(parts)) == json.loads(codec.dumps(categories, codec.get_backend("json")))
+
+
+def test_dump_is_readable_by_load_catalog(tmp_path: Path, categories: list) -> None:
+    categories[0].products[1].quantity = 1
+    path = tmp_path / "catalog.json"
+    with open(path, "wb") as file:
+        written = codec.dump(categories, file)
+    assert written == path.stat().st_size
+    with use_registry():
+        loaded, report = load_catalog(str(path))
+        assert fields(loaded) == fields(categories) and report.errors == []
+        assert fields(codec.load(io.BytesIO(path.read_bytes()))) == fields(categories)
+
+
+def test_get_backend() -> None:
+    assert codec.get_backend("json").name == "json"
+    assert codec.get_backend() is next(iter(codec.BACKENDS.values()))
+    with pytest.raises(ValueError):
+        codec.get_backend("yaml")
+
+
+def test_unknown_product_class_is_rejected() -> None:
+    class Custom(Product):
+        __slots__ = ()
+
+    with use_registry(), pytest.raises(TypeError):
+        codec.product_to_dict(Custom("Товар", "Описание", 1.0, 1))
@@ -0,0 +1,78 @@
+import io
+import json
+from pathlib import Path
+from typing import List
+
+from src.data_loader import (
+    _iter_json_array,
+    iter_categories_from_json,
+    load_categories_from_json,
+    load_categories_from_shards,
+)
+from src.moduls import Category
+from src.registry import use_registry
+
+CATALOG = [
+    {
+        "name": "Смартфоны",
+        "description": "Описание",
+        "products": [
+            {"name": "Iphone 15", "description": "512GB", "price": 210000.0, "quantity": 8},
+            {"name": "Xiaomi", "description": "1024GB", "price": 31000.0, "quantity": 14},
+        ],
+    },
+    {"name": "Телевизоры", "description": "Описание", "products": []},
+]
+
+
+def write_catalog(tmp_path: Path) -> str:
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps(CATALOG, ensure_ascii=False, indent=2), encoding="utf-8")
+    return str(path)
+
+
+def test_iter_json_array_small_chunks() -> None:
+    """Элементы корректно собираются, даже если блок чтения меньше одного элемента"""
+    text = json.dumps(CATALOG, ensure_ascii=False)
+    assert list(_iter_json_array(io.StringIO(text), chunk_size=7)) == CATALOG
+    assert list(_iter_json_array(io.StringIO(" [ ] "))) == []
+
+
+def test_load_categories_from_json(tmp_path: Path) -> None:
+    categories = load_categories_from_json(write_catalog(tmp_path))
+    assert [c.name for c in categories] == ["Смартфоны", "Телевизоры"]
+    assert [p.name for p in categories[0].products] == ["Iphone 15", "Xiaomi"]
+    assert categories[1].products == []
+
+
+def test_iter_categories_callback_batches(tmp_path: Path) -> None:
+    batches: List[List[Category]] = []
+    categories = list(iter_categories_from_json(write_catalog(tmp_path), batch_size=5, callback=batches.append))
+    assert len(batches) == 1
+    assert batches[0] == categories
+
+
+def test_load_categories_from_shards(tmp_path: Path) -> None:
+    """Шарды разбираются в пуле процессов, одноимённые категории сливаются"""
+    for i in range(3):
+        shard = [
+            {
+                "name": "Смартфоны",
+                "description": "Описание",
+                "products": [{"name": f"Phone {i}", "description": "D", "price": 100.0 * (i + 1), "quantity": i + 1}],
+            },
+            {"name": f"Категория {i}", "description": "Описание", "products": []},
+        ]
+        (tmp_path / f"shard_{i}.json").write_text(json.dumps(shard, ensure_ascii=False), encoding="utf-8")
+
+    with use_registry() as registry:
+        categories = load_categories_from_shards(str(tmp_path), max_workers=2)
+        assert registry.snapshot() == {"category_count": 4, "product_count": 3}
+
+    assert [c.name for c in categories] == ["Смартфоны", "Категория 0", "Категория 1", "Категория 2"]
+    assert [p.name for p in categories[0].products] == ["Phone 0", "Phone 1", "Phone 2"]
+    assert categories[0].total_quantity == 6
+
+    with use_registry():
+        single = load_categories_from_shards(str(tmp_path / "shard_1.json"))
+    assert [c.name for c in single] == ["Смартфоны", "Категория 1"]
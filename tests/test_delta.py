@@ -0,0 +1,125 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src.delta import apply_delta, apply_delta_file
+from src.moduls import Category, Product, Smartphone
+
+
+@pytest.fixture
+def categories() -> list:
+    return [
+        Category(
+            "Смартфоны",
+            "Описание",
+            [Product("Iphone 15", "512GB", 210000.0, 8), Product("Xiaomi", "1024GB", 31000.0, 14)],
+        )
+    ]
+
+
+def test_apply_delta_patches_in_place(categories: list) -> None:
+    phones = categories[0]
+    iphone = phones.find_by_name("Iphone 15")[0]
+    lines = [
+        json.dumps({"op": "upsert", "category": "Смартфоны", "product": {"name": "Iphone 15", "price": 199000.0}}),
+        json.dumps(
+            {
+                "op": "upsert",
+                "category": "Смартфоны",
+                "product": {"name": "Pixel", "description": "128GB", "price": 50000.0, "quantity": 2},
+            }
+        ),
+        json.dumps({"op": "delete", "category": "Смартфоны", "name": "Xiaomi"}),
+        json.dumps({"op": "delete", "category": "Смартфоны", "name": "Нет такого"}),
+        "",
+    ]
+
+    stats = apply_delta(categories, lines)
+
+    assert stats == {"updated": 1, "inserted": 1, "deleted": 1, "missing": 1, "categories_created": 0}
+    assert phones.find_by_name("Iphone 15")[0] is iphone
+    assert iphone.price == 199000.0
+    assert [p.name for p in phones.products] == ["Iphone 15", "Pixel"]
+    assert phones.total_quantity == 10
+    assert phones.stock_value == 199000.0 * 8 + 50000.0 * 2
+    assert [p.name for p in phones.cheapest(1)] == ["Pixel"]
+
+
+def test_apply_delta_file_creates_category(tmp_path: Path, categories: list) -> None:
+    path = tmp_path / "delta.jsonl"
+    record = {
+        "op": "upsert",
+        "category": "Телевизоры",
+        "category_description": "Описание",
+        "product": {"name": "QLED", "description": "55", "price": 123000.0, "quantity": 7},
+    }
+    path.write_text(json.dumps(record, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    assert apply_delta_file(categories, str(path))["categories_created"] == 1
+    assert str(categories[1]) == "Телевизоры, количество продуктов: 7 шт."
+
+
+def test_apply_delta_rejects_unknown_operation(categories: list) -> None:
+    with pytest.raises(ValueError, match="Строка 1"):
+        apply_delta(categories, ['{"op": "merge", "category": "Смартфоны"}'])
+
+
+def test_apply_delta_inserts_typed_products(categories: list) -> None:
+    phone = {
+        "type": "smartphone",
+        "name": "Pixel",
+        "description": "128GB",
+        "price": 50000.0,
+        "quantity": 2,
+        "efficiency": 90.0,
+        "model": "8",
+        "memory": 128,
+        "color": "Black",
+    }
+    lines = [
+        json.dumps({"op": "upsert", "category": "Смартфоны", "product": phone}),
+        json.dumps({"op": "upsert", "category": "Смартфоны", "product": {"name": "Pixel", "quantity": 0}}),
+    ]
+    assert apply_delta(categories, lines)["inserted"] == 1
+    pixel = categories[0].find_by_name("Pixel")[0]
+    assert isinstance(pixel, Smartphone) and pixel.memory == 128 and pixel.quantity == 0
+    assert categories[0].find_by_attribute("color", "Black") == [pixel]
+
+
+@pytest.mark.parametrize(
+    "record, message",
+    [
+        (
+            {"op": "upsert", "category": "Смартфоны", "product": {"name": "Pixel", "description": "D", "price": 1.0}},
+            "нет поля quantity",
+        ),
+        (
+            {
+                "op": "upsert",
+                "category": "Смартфоны",
+                "product": {"name": "Pixel", "description": "D", "price": 1.0, "quantity": 0},
+            },
+            "положительным",
+        ),
+        ({"op": "upsert", "category": "Смартфоны", "product": {"name": "Iphone 15", "price": "дёшево"}}, "поле price"),
+        ({"op": "upsert", "category": "Смартфоны", "product": {"name": "Pixel", "type": "phone"}}, "неизвестный тип"),
+        ({"op": "delete", "category": "Смартфоны"}, "нет поля name"),
+    ],
+)
+def test_invalid_delta_changes_nothing(categories: list, record: dict, message: str) -> None:
+    """Ошибка в любой строке обнаруживается до изменения категорий"""
+    lines = [
+        json.dumps({"op": "upsert", "category": "Смартфоны", "product": {"name": "Iphone 15", "price": 1.0}}),
+        json.dumps({"op": "delete", "category": "Смартфоны", "name": "Xiaomi"}),
+        json.dumps(record),
+    ]
+    with pytest.raises(ValueError, match=f"Строка 3: .*{message}"):
+        apply_delta(categories, lines)
+    assert [(p.name, p.price) for p in categories[0].products] == [("Iphone 15", 210000.0), ("Xiaomi", 31000.0)]
+
+
+def test_apply_delta_rejects_malformed_json(categories: list) -> None:
+    with pytest.raises(ValueError, match="Строка 2"):
+        apply_delta(categories, ['{"op": "delete", "category": "Смартфоны", "name": "Xiaomi"}', "{не json"])
+    assert categories[0].quantity == 2
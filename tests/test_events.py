@@ -0,0 +1,119 @@
+import asyncio
+from typing import Iterator, List
+
+import pytest
+
+from src.events import ChangeEvent, ChangeQueue, observe_products
+from src.moduls import Category, Product
+from src.registry import use_registry
+
+
+@pytest.fixture
+def queue() -> Iterator[ChangeQueue]:
+    queue = ChangeQueue(maxsize=100, batch_size=10)
+    observe_products(queue)
+    try:
+        with use_registry():
+            yield queue
+    finally:
+        observe_products(None)
+        queue.stop()
+
+
+def collect(queue: ChangeQueue) -> List[List[ChangeEvent]]:
+    batches: List[List[ChangeEvent]] = []
+    queue.subscribe(batches.append)
+    return batches
+
+
+def test_repeated_updates_are_coalesced(queue: ChangeQueue) -> None:
+    batches = collect(queue)
+    product = Product("Телефон", "Описание", 100.0, 5)
+    other = Product("Чехол", "Описание", 10.0, 5)
+    for price in (110.0, 120.0, 130.0):
+        product.price = price
+    product.quantity = 4
+    other.quantity = 6
+    other.quantity = 5  # изменение отменилось до доставки
+    assert len(queue) == 3
+
+    assert queue.drain() == 1
+    assert batches == [[ChangeEvent(product, "price", 100.0, 130.0), ChangeEvent(product, "quantity", 5, 4)]]
+    stats = queue.stats()
+    assert stats["coalesced"] == 3 and stats["delivered"] == 2 and stats["pending"] == 0
+
+
+def test_batches_and_backpressure_without_worker() -> None:
+    """Без фонового потока переполненная очередь доставляется в потоке производителя"""
+    queue = ChangeQueue(maxsize=3, batch_size=2)
+    batches = collect(queue)
+    with use_registry():
+        products = [Product(f"Товар {i}", "Описание", 1.0, 1) for i in range(7)]
+    for product in products:
+        queue.put(product, "price", 1.0, 2.0)
+    assert [len(batch) for batch in batches] == [2, 1, 2, 1]
+    assert len(queue) == 1 and queue.stats()["waits"] == 2
+
+
+def test_bulk_reprice_is_one_notification(queue: ChangeQueue) -> None:
+    batches = collect(queue)
+    products = [Product(f"Товар {i}", "Описание", 100.0, 1) for i in range(1000)]
+    category = Category("Категория", "Описание", products)
+    shared = Category("Акции", "Описание", products[:2])
+    assert category.reprice(lambda p: p.price * 1.1 if p.name != "Товар 0" else p.price) == 999
+    queue.drain()
+    assert len(batches) == 1 and len(batches[0]) == 999
+    assert category.total_price == pytest.approx(100.0 + 999 * 110.0)
+    assert category.cheapest(1)[0] is products[0]
+    assert shared.total_price == pytest.approx(100.0 + 110.0)  # другая категория товара тоже пересчитана
+
+
+def test_background_thread_delivers_everything(queue: ChangeQueue) -> None:
+    queue.maxsize = 5
+    delivered: List[ChangeEvent] = []
+    queue.subscribe(delivered.extend)
+    queue.subscribe(lambda batch: 1 / 0)  # ошибка подписчика не мешает остальным
+    products = [Product(f"Товар {i}", "Описание", 1.0, 1) for i in range(200)]
+    queue.start(linger=0.001)
+    for product in products:
+        product.price = 2.0
+    queue.stop()
+    assert len(delivered) == 200 and queue.stats()["errors"] == queue.stats()["batches"]
+
+
+def test_asyncio_drain(queue: ChangeQueue) -> None:
+    batches = collect(queue)
+
+    async def scenario() -> None:
+        queue.start_async(linger=0.001)
+        product = Product("Телефон", "Описание", 100.0, 5)
+        product.quantity = 1
+        await asyncio.sleep(0.01)
+        assert batches and batches[0][0].new == 1
+        product.quantity = 2
+        await queue.stop_async()
+
+    asyncio.run(scenario())
+    assert [event.new for batch in batches for event in batch] == [1, 2]
+
+
+def test_updates_after_batch_are_delivered_after_it(queue: ChangeQueue) -> None:
+    batches = collect(queue)
+    product = Product("Телефон", "Описание", 10.0, 5)
+    category = Category("Категория", "Описание", [product])
+    product.price = 20.0
+    category.reprice(lambda _: 30.0)
+    product.price = 40.0
+    queue.drain()
+    assert [[(event.old, event.new) for event in batch] for batch in batches] == [
+        [(10.0, 20.0)],
+        [(20.0, 30.0)],
+        [(30.0, 40.0)],
+    ]
+
+
+def test_reprice_counts_every_occurrence_of_a_product(queue: ChangeQueue) -> None:
+    product = Product("Телефон", "Описание", 15.0, 2)
+    category = Category("Категория", "Описание", [product, product])
+    assert category.reprice(lambda _: 20.0) == 1
+    assert category.total_price == 40.0 and category.stock_value == 80.0
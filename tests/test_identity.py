@@ -0,0 +1,86 @@
+import json
+from pathlib import Path
+
+from src.data_loader import load_catalog
+from src.identity import IdentityMap
+from src.moduls import Product, Smartphone
+from src.registry import use_registry
+
+PHONE = {
+    "type": "smartphone",
+    "name": "Iphone 15",
+    "description": "512GB",
+    "price": 210000.0,
+    "quantity": 8,
+    "efficiency": 98.2,
+    "model": "15",
+    "memory": 512,
+    "color": "Gray space",
+}
+
+
+def write_catalog(tmp_path: Path, data: object) -> str:
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+
+def test_shared_product_across_categories(tmp_path: Path) -> None:
+    path = write_catalog(
+        tmp_path,
+        [
+            {"name": "Смартфоны", "description": "", "products": [PHONE]},
+            {"name": "Apple", "description": "", "products": [PHONE, {**PHONE, "name": "Iphone 14"}]},
+        ],
+    )
+    identity = IdentityMap()
+    with use_registry():
+        (phones, apple), _ = load_catalog(path, identity)
+        shared = phones.products[0]
+        assert isinstance(shared, Smartphone) and apple.products[0] is shared
+        shared.quantity = 3  # остаток один на обе категории
+        assert phones.total_quantity == 3 and apple.total_quantity == 3 + 8
+    # строки разных товаров с одинаковым значением — один объект
+    assert apple.products[1].color is shared.color and apple.products[1].description is shared.description
+    report = identity.report()
+    assert report["products"] == 2 and report["shared_products"] == 1
+    assert report["shared_strings"] == 2 and report["bytes_saved"] > 0
+
+
+def test_sku_key_duplicates_and_conflicts(tmp_path: Path) -> None:
+    """Ключ — SKU, если он есть; повтор внутри категории попадает в отчёт, расхождение цены учитывается"""
+    plain = {"name": "Чехол", "description": "Силикон", "price": 100.0, "quantity": 3}
+    path = write_catalog(
+        tmp_path,
+        [
+            {
+                "name": "Аксессуары",
+                "products": [
+                    {**plain, "sku": "A-1"},
+                    {**plain, "sku": "A-2"},
+                    {**plain, "sku": "A-1", "quantity": 5},
+                    {**plain, "sku": ["A-3"]},
+                ],
+            },
+            {"name": "Скидки", "products": [{**plain, "sku": "A-1", "price": 90.0}]},
+        ],
+    )
+    identity = IdentityMap()
+    with use_registry():
+        (category, sale), report = load_catalog(path, identity)
+    first, second = category.products
+    assert type(first) is Product and first is not second and first.price == 100.0
+    assert sale.products == [first] and category.total_quantity == 6
+    assert identity.report()["shared_products"] == 1 and identity.report()["conflicts"] == 1
+    assert report.loaded == 3
+    assert report.errors == [
+        {"category": 0, "product": 2, "error": "повтор товара 'A-1' в категории"},
+        {"category": 0, "product": 3, "error": "поле sku: ожидался str/int"},
+    ]
+
+
+def test_load_catalog_without_identity_keeps_copies(tmp_path: Path) -> None:
+    path = write_catalog(tmp_path, [{"name": "А", "products": [PHONE]}, {"name": "Б", "products": [PHONE]}])
+    with use_registry():
+        (a, b), _ = load_catalog(path)
+    assert a.products[0] is not b.products[0]
@@ -0,0 +1,66 @@
+import pytest
+
+from src.indexes import ProductIndex
+from src.moduls import Category, LawnGrass, Product, Smartphone
+
+
+@pytest.fixture
+def category() -> Category:
+    return Category(
+        "Разное",
+        "Описание",
+        [
+            Smartphone("Iphone 15", "512GB", 210000.0, 8, 98.2, "15", 512, "Gray"),
+            Smartphone("Xiaomi", "1024GB", 31000.0, 14, 90.3, "Note 11", 1024, "Синий"),
+            LawnGrass("Газон", "Трава", 500.0, 20, "Россия", "7 дней", "Зеленый"),
+            Product("Чехол", "Кожа", 1500.0, 3),
+        ],
+    )
+
+
+def test_find_by_name_and_attribute(category: Category) -> None:
+    assert [p.model for p in category.find_by_name("Xiaomi")] == ["Note 11"]  # type: ignore[attr-defined]
+    assert category.find_by_name("Нет такого") == []
+    assert [p.name for p in category.find_by_attribute("memory", 512)] == ["Iphone 15"]
+    assert [p.name for p in category.find_by_attribute("country", "Россия")] == ["Газон"]
+    with pytest.raises(KeyError):
+        category.find_by_attribute("model", "15")
+
+
+def test_price_index_tracks_changes(category: Category) -> None:
+    assert [p.name for p in category.cheapest(2)] == ["Газон", "Чехол"]
+    assert [p.name for p in category.find_by_price(1000.0, 50000.0)] == ["Чехол", "Xiaomi"]
+
+    grass = category.find_by_name("Газон")[0]
+    grass.price = 100000.0
+    category.add_product(Product("Плёнка", "Стекло", 300.0, 5))
+    category.remove_product(category.find_by_name("Чехол")[0])
+
+    assert [p.name for p in category.cheapest(3)] == ["Плёнка", "Xiaomi", "Газон"]
+    assert category.find_by_price(high=1000.0)[0].name == "Плёнка"
+
+
+def test_query_combines_conditions(category: Category) -> None:
+    assert [p.name for p in category.query(color="Синий", high=50000.0)] == ["Xiaomi"]
+    assert category.query(color="Синий", low=50000.0) == []
+    assert [p.name for p in category.query(low=200000.0)] == ["Iphone 15"]
+
+
+def test_query_by_non_indexed_attribute(category: Category) -> None:
+    """Атрибут без индекса не вызывает KeyError, а дофильтровывает кандидатов"""
+    assert [p.name for p in category.query(model="15")] == ["Iphone 15"]
+    assert [p.name for p in category.query(model="Note 11", memory=1024)] == ["Xiaomi"]
+    assert category.query(model="15", high=1000.0) == []
+
+
+def test_index_handles_duplicate_product() -> None:
+    product = Product("A", "Desc", 10.0, 1)
+    index = ProductIndex()
+    index.add(product)
+    index.add(product)
+    product.price = 20.0
+    index.reprice(product, 10.0)
+    index.reprice(product, 10.0)
+    index.remove(product)
+    assert index.cheapest(5) == [product]
+    assert list(index.price_range(15.0, 25.0)) == [product]
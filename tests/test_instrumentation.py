@@ -0,0 +1,66 @@
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from src.data_loader import load_categories_from_json
+from src.instrumentation import Metrics, metrics, profile
+from src.moduls import Category, Order, Product
+
+
+@pytest.fixture
+def enabled_metrics() -> Iterator[Metrics]:
+    metrics.reset()
+    metrics.enabled = True
+    yield metrics
+    metrics.enabled = False
+    metrics.reset()
+
+
+def test_disabled_metrics_record_nothing() -> None:
+    metrics.reset()
+    Category("Категория", "Описание", [Product("A", "Desc", 10.0, 1)])
+    assert metrics.snapshot() == {"counters": {}, "histograms": {}}
+
+
+def test_hot_paths_are_instrumented(enabled_metrics: Metrics, tmp_path: Path) -> None:
+    product = Product("A", "Desc", 10.0, 2)
+    Category("Категория", "Описание").add_product(product)
+    Order(product, 1)
+    with pytest.raises(ValueError):
+        Order(product, 5)
+    path = tmp_path / "catalog.json"
+    path.write_text('[{"name": "C", "description": "D", "products": []}]', encoding="utf-8")
+    load_categories_from_json(str(path))
+
+    snapshot = enabled_metrics.snapshot()
+    assert snapshot["counters"] == {"products_created": 1, "orders_created": 1, "orders_rejected": 1}
+    histograms = snapshot["histograms"]
+    assert set(histograms) == {
+        "product_init",
+        "product_bulk_build",
+        "category_add_product",
+        "order_validate",
+        "loader_parse",
+        "loader_build",
+    }
+    assert histograms["product_init"]["buckets"]["+Inf"] == 1  # type: ignore[index]
+
+
+def test_prometheus_format() -> None:
+    local = Metrics()
+    local.increment("orders_created", 3)
+    local.observe("order_validate", 0.002)
+    text = local.to_prometheus()
+    assert "# TYPE catalog_orders_created_total counter\ncatalog_orders_created_total 3\n" in text
+    assert 'catalog_order_validate_seconds_bucket{le="0.001"} 0' in text
+    assert 'catalog_order_validate_seconds_bucket{le="0.01"} 1' in text
+    assert "catalog_order_validate_seconds_count 1" in text
+
+
+def test_profile_context_manager() -> None:
+    with profile(limit=5) as report:
+        Product.from_records([("A", "Desc", 1.0, 1)] * 100)
+    assert "from_records" in report.cpu
+    assert report.peak_bytes > 0
+    assert report.memory
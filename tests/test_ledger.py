@@ -0,0 +1,73 @@
+from pathlib import Path
+
+import pytest
+
+from src.ledger import Ledger
+from src.moduls import Category, Order, Product
+from src.orders import OrderEngine
+from src.registry import use_registry
+
+HOUR = 3600.0
+
+
+@pytest.fixture
+def products() -> list:
+    with use_registry():
+        phone = Product("Телефон", "Описание", 100.0, 50)
+        case = Product("Чехол", "Описание", 10.0, 50)
+        Category("Смартфоны", "Описание", [phone, case])
+    return [phone, case]
+
+
+def test_rollups_update_on_append(tmp_path: Path, products: list) -> None:
+    phone, case = products
+    with Ledger(str(tmp_path)) as ledger:
+        ledger.append(Order(phone, 2), timestamp=10 * HOUR)
+        ledger.append(Order(case, 3), timestamp=10 * HOUR + 5)
+        entry = ledger.append(Order(phone, 1), category="Акции", timestamp=12 * HOUR)
+        assert entry.seq == 3 and entry.amount == 100.0
+        assert ledger.product_sales("Телефон") == (3, 300.0)
+        assert ledger.category_sales("Смартфоны") == (5, 230.0)
+        assert ledger.category_sales("Акции") == (1, 100.0)
+        assert ledger.product_sales("Нет такого") == (0, 0.0)
+        assert ledger.hourly_revenue("Смартфоны") == [(10, 5, 230.0)]
+
+
+def test_sales_between_hours(tmp_path: Path, products: list) -> None:
+    phone, _ = products
+    with Ledger(str(tmp_path)) as ledger:
+        for hour in (1, 2, 2, 5):
+            ledger.append(Order(phone, 1), timestamp=hour * HOUR)
+        ledger.append(Order(phone, 4), timestamp=3 * HOUR)  # запись задним числом
+        assert ledger.category_sales_between("Смартфоны", 2 * HOUR, 5 * HOUR) == (6, 600.0)
+        assert ledger.category_sales_between("Смартфоны", 0, 100 * HOUR) == (8, 800.0)
+        assert ledger.category_sales_between("Смартфоны", 6 * HOUR, 7 * HOUR) == (0, 0.0)
+
+
+def test_recovery_from_segments_and_snapshot(tmp_path: Path, products: list) -> None:
+    """После снимка при открытии воспроизводятся только более поздние записи, недописанная строка отбрасывается"""
+    phone, case = products
+    with Ledger(str(tmp_path), segment_size=3, snapshot_every=4) as ledger:
+        for i in range(7):
+            ledger.append(Order(phone if i % 2 else case, 1), timestamp=i * HOUR)
+    assert len(list(tmp_path.glob("segment-*.jsonl"))) == 3
+    assert (tmp_path / "snapshot.json").exists()
+    with open(tmp_path / "segment-000002.jsonl", "ab") as file:
+        file.write(b'[8, 0.0, "Sm')
+
+    with Ledger(str(tmp_path), segment_size=3, snapshot_every=4) as ledger:
+        assert ledger.seq == 7
+        assert ledger.product_sales("Телефон") == (3, 300.0)
+        assert ledger.category_sales("Смартфоны") == (7, 340.0)
+        ledger.append(Order(phone, 1), timestamp=7 * HOUR)
+        assert [entry.seq for entry in ledger.entries()] == list(range(1, 9))
+
+
+def test_order_engine_writes_ledger(tmp_path: Path, products: list) -> None:
+    phone, case = products
+    with Ledger(str(tmp_path)) as ledger:
+        engine = OrderEngine(ledger=ledger)
+        engine.place_order(phone, 2)
+        engine.place_orders([(phone, 1), (case, 5)])
+        assert engine.place_orders([(phone, 1000)]).failures
+        assert ledger.seq == 3 and ledger.category_sales("Смартфоны") == (8, 350.0)
@@ -1,8 +1,18 @@
+import threading
 from typing import List
 
 import pytest
 
-from src.moduls import Category, Product, Smartphone, LawnGrass, BaseProduct
+from src.moduls import (
+    BaseProduct,
+    Category,
+    LawnGrass,
+    Product,
+    Smartphone,
+    ZeroQuantityError,
+    print_creation_event,
+    set_creation_hook,
+)
 
 
 @pytest.fixture
@@ -174,3 +184,143 @@ def test_category_middle_price_empty():
     """Проверка среднего ценника пустой категории"""
     category = Category("Пустая категория", "Описание", [])
     assert category.middle_price() == 0
+
+
+def test_product_from_records_skips_creation_hook(capsys) -> None:
+    """Массовое создание не вызывает обработчик и поддерживает словари и кортежи"""
+    products = Product.from_records(
+        [{"name": "A", "description": "Desc", "price": 100.0, "quantity": 2}, ("B", "Desc", 200.0, 3)]
+    )
+    assert capsys.readouterr().out == ""
+    assert [p.name for p in products] == ["A", "B"]
+    assert products[0] + products[1] == 100.0 * 2 + 200.0 * 3
+
+    phones = Smartphone.from_records([("Phone", "Desc", 200.0, 1, 90.0, "X", 128, "Black")])
+    assert isinstance(phones[0], Smartphone)
+    assert phones[0].memory == 128
+
+    with pytest.raises(ZeroQuantityError):
+        Product.from_records([("C", "Desc", 1.0, 0)])
+
+
+def test_category_from_records() -> None:
+    grass = ("Газон", "Desc", 500.0, 20, "RU", "7 дней", "Green")
+    categories = Category.from_records(
+        [{"name": "Трава", "description": "Desc", "products": [grass]}],
+        product_cls=LawnGrass,
+    )
+    assert categories[0].name == "Трава"
+    assert categories[0].products[0].country == "RU"
+
+
+def test_creation_hook_sampling() -> None:
+    """Обработчик получает структурированные события с заданной частотой"""
+    events = []
+    set_creation_hook(events.append, sample_every=2)
+    try:
+        for i in range(4):
+            Product(f"P{i}", "Desc", 10.0, 1)
+    finally:
+        set_creation_hook(print_creation_event)
+    assert len(events) == 2
+    assert events[0]["class"] == "Product"
+    assert events[0]["params"] == ("P1", "Desc", 10.0, 1)
+
+
+def test_products_use_slots() -> None:
+    """У продуктов нет __dict__, а repr по-прежнему показывает все поля"""
+    s = Smartphone("Phone", "Desc", 200.0, 1, 90.0, "X", 128, "Black")
+    assert not hasattr(s, "__dict__")
+    assert repr(s) == (
+        "<Smartphone: {'name': 'Phone', 'description': 'Desc', 'price': 200.0, 'quantity': 1, "
+        "'efficiency': 90.0, 'model': 'X', 'memory': 128, 'color': 'Black'}>"
+    )
+    with pytest.raises(AttributeError):
+        s.unknown = 1  # type: ignore[attr-defined]
+
+
+def test_category_aggregates_follow_changes() -> None:
+    """Агрегаты категории обновляются при добавлении, удалении и изменении продуктов"""
+    p1 = Product("Товар 1", "Описание", 100.0, 5)
+    p2 = Product("Товар 2", "Описание", 200.0, 3)
+    category = Category("Категория", "Описание", [p1])
+    category.add_product(p2)
+
+    assert category.total_quantity == 8
+    assert category.stock_value == 100.0 * 5 + 200.0 * 3
+    assert category.middle_price() == 150.0
+
+    category.update_product(p1, price=300.0, quantity=1)
+    p2.quantity = 10
+    assert str(category) == "Категория, количество продуктов: 11 шт."
+    assert category.stock_value == 300.0 * 1 + 200.0 * 10
+    assert category.middle_price() == 250.0
+
+    category.remove_product(p1)
+    assert category.products == [p2]
+    assert category.total_price == 200.0
+    assert category.stock_value == 2000.0
+
+    p1.price = 1.0  # удалённый продукт больше не влияет на категорию
+    assert category.total_price == 200.0
+
+    with pytest.raises(ValueError):
+        category.remove_product(p1)
+
+
+def test_category_products_returns_copy(sample_products) -> None:
+    category = Category("Смартфоны", "Описание", sample_products)
+    category.products.append(Product("Лишний", "Описание", 1.0, 1))
+    sample_products.pop()
+    assert len(category.products) == 3
+    assert str(category) == "Смартфоны, количество продуктов: 27 шт."
+
+
+def test_category_snapshot_is_stable(category) -> None:
+    """Полученная версия не меняется при изменениях категории; смена цены не копирует состав"""
+    before = category.snapshot()
+    assert category.snapshot() is before
+    extra = Product("Чехол", "Силикон", 1000.0, 2)
+    category.add_product(extra)
+    after = category.snapshot()
+    assert len(before.products) == 3 and after.products[-1] is extra
+    assert after.version > before.version and after.total_quantity == before.total_quantity + 2
+
+    extra.price = 500.0
+    repriced = category.snapshot()
+    assert repriced.products is after.products and repriced.total_price == after.total_price - 500.0
+
+
+def test_category_snapshot_keeps_values_of_its_version(category) -> None:
+    """Изменение остатка продукта после публикации не расходится с агрегатами уже полученной версии"""
+    snapshot = category.snapshot()
+    product = snapshot.products[0]
+    quantity, price = snapshot.quantities[0], snapshot.prices[0]
+    product.quantity = 1
+    product.price = price + 1
+    assert snapshot.quantities[0] == quantity and snapshot.prices[0] == price
+    assert sum(snapshot.quantities) == snapshot.total_quantity
+    assert sum(p * q for p, q in zip(snapshot.prices, snapshot.quantities)) == snapshot.stock_value
+    assert category.snapshot().quantities[0] == 1
+
+
+def test_iteration_is_not_torn_by_concurrent_writer(category) -> None:
+    added = [Product(f"Товар {i}", "Описание", 1.0, 1) for i in range(2000)]
+    stop = threading.Event()
+
+    def writer() -> None:
+        first = category.products[0]
+        for i, product in enumerate(added):
+            category.add_product(product)
+            first.quantity = 1 + i % 7  # остатки меняются параллельно с чтением версий
+        stop.set()
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    while not stop.is_set():
+        snapshot = category.snapshot()
+        assert list(category.iter_products())[:3] == list(snapshot.products)[:3]
+        assert sum(snapshot.quantities) == snapshot.total_quantity
+        assert len(snapshot.quantities) == len(snapshot.products)
+    thread.join()
+    assert len(category.products) == 3 + len(added)
@@ -0,0 +1,120 @@
+import sys
+import threading
+from typing import List
+
+import pytest
+
+from src.moduls import Category, Order, Product
+from src.orders import OrderEngine
+
+
+def test_place_order_decrements_stock() -> None:
+    product = Product("Iphone 15", "512GB", 210000.0, 8)
+    category = Category("Смартфоны", "Описание", [product])
+    engine = OrderEngine()
+
+    order = engine.place_order(product, 3)
+
+    assert isinstance(order, Order)
+    assert order.total_price == 210000.0 * 3
+    assert product.quantity == 5
+    assert category.total_quantity == 5
+
+    with pytest.raises(ValueError):
+        engine.place_order(product, 6)
+    with pytest.raises(ValueError):
+        engine.place_order(product, 0)
+    assert product.quantity == 5
+
+
+def test_concurrent_orders_never_oversell() -> None:
+    """Нагрузочная проверка: потоки конкурируют за остатки, но продано ровно столько, сколько было"""
+    products = [Product(f"Товар {i}", "Описание", 10.0, 500) for i in range(4)]
+    category = Category("Категория", "Описание", products)
+    engine = OrderEngine(stripes=2)
+    placed: List[Order] = []
+    placed_lock = threading.Lock()
+
+    def worker(seed: int) -> None:
+        local = []
+        for i in range(600):
+            try:
+                local.append(engine.place_order(products[(seed + i) % len(products)], 1 + i % 3))
+            except ValueError:
+                pass
+        with placed_lock:
+            placed.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for product in products:
+        sold = sum(order.quantity for order in placed if order.product is product)
+        assert product.quantity >= 0
+        assert sold + product.quantity == 500
+    assert category.total_quantity == sum(p.quantity for p in products)
+
+
+def test_stock_value_survives_concurrent_price_and_quantity_changes() -> None:
+    """Цена и остаток одного товара меняются из разных потоков, а стоимость остатков категории не уплывает"""
+    product = Product("Товар", "Описание", 10.0, 100_000)
+    shared = Product("Общий", "Описание", 10.0, 100_000)
+    category = Category("Категория", "Описание", [product, shared])
+    sale = Category("Акция", "Описание", [shared])
+    engine = OrderEngine()
+
+    def buy() -> None:
+        for _ in range(20_000):
+            engine.place_order(product, 1)
+            engine.place_order(shared, 1)
+
+    def change_prices() -> None:
+        for i in range(2_000):
+            product.price = 10.0 + i % 7
+            category.reprice(lambda p: 20.0 + i % 5)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=buy), threading.Thread(target=change_prices)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    assert category.stock_value == pytest.approx(product.price * product.quantity + shared.price * shared.quantity)
+    assert sale.stock_value == pytest.approx(shared.price * shared.quantity)
+
+
+def test_place_orders_batch_groups_lines() -> None:
+    phone = Product("Iphone 15", "512GB", 100.0, 5)
+    case = Product("Чехол", "Кожа", 10.0, 3)
+    engine = OrderEngine()
+
+    result = engine.place_orders([(phone, 2), (case, 3), (phone, 3)])
+
+    assert result.ok
+    assert [order.quantity for order in result.orders] == [2, 3, 3]
+    assert result.total_price == 100.0 * 5 + 10.0 * 3
+    assert phone.quantity == 0
+    assert case.quantity == 0
+
+
+def test_place_orders_is_all_or_nothing() -> None:
+    """Ошибки собираются по всем строкам, а остатки не меняются"""
+    phone = Product("Iphone 15", "512GB", 100.0, 5)
+    case = Product("Чехол", "Кожа", 10.0, 3)
+    engine = OrderEngine()
+
+    result = engine.place_orders([(phone, 4), (case, 1), (phone, 2), ("Не товар", 1), (case, -1)])
+
+    assert not result.ok
+    assert result.orders == []
+    assert [failure.line for failure in result.failures] == [0, 2, 3, 4]
+    assert result.failures[0].reason == "Недостаточно товара на складе"
+    assert phone.quantity == 5
+    assert case.quantity == 3
@@ -0,0 +1,66 @@
+import io
+
+import pytest
+
+from src.moduls import Category, CategoryIterator, Product
+from src.pipeline import Pipeline
+
+
+@pytest.fixture
+def category() -> Category:
+    products = [Product(f"Товар {i}", "Описание", 100.0 * (5 - i), i + 1) for i in range(5)]
+    return Category("Категория", "Описание", products)
+
+
+def test_pipeline_steps_are_lazy() -> None:
+    seen = []
+
+    def source():
+        for i in range(100):
+            seen.append(i)
+            yield i
+
+    result = Pipeline(source()).filter(lambda x: x % 2 == 0).map(lambda x: x * 10).skip(1).take(2)
+    assert seen == []
+    assert list(result) == [20, 40]
+    assert seen == [0, 1, 2, 3, 4]
+
+
+def test_sorting_steps_are_lazy() -> None:
+    """sorted_by и top_k читают источник только при первом next()"""
+    seen = []
+
+    def source():
+        for i in (3, 1, 2):
+            seen.append(i)
+            yield i
+
+    ordered = Pipeline(source()).sorted_by(lambda x: x)
+    top = Pipeline(source()).top_k(2, key=lambda x: x, largest=True)
+    assert seen == []
+    assert next(ordered) == 1
+    assert list(top) == [3, 2]
+    assert seen == [3, 1, 2, 3, 1, 2]
+
+
+def test_category_iterator_pipeline(category: Category) -> None:
+    cheap = CategoryIterator(category).filter(lambda p: p.price < 400).map(lambda p: p.name)
+    assert list(cheap) == ["Товар 2", "Товар 3", "Товар 4"]
+
+    top = CategoryIterator(category).top_k(2, key=lambda p: p.price)
+    assert [p.name for p in top] == ["Товар 4", "Товар 3"]
+
+    ordered = CategoryIterator(category).sorted_by(lambda p: p.quantity, reverse=True).take(1)
+    assert [p.name for p in ordered] == ["Товар 4"]
+
+    chunks = CategoryIterator(category).map(lambda p: p.quantity).chunks(2)
+    assert list(chunks) == [[1, 2], [3, 4], [5]]
+    with pytest.raises(ValueError):
+        CategoryIterator(category).chunks(0)
+
+
+def test_write_products_streams_lines(category: Category) -> None:
+    buffer = io.StringIO()
+    assert category.write_products(buffer) == 5
+    assert buffer.getvalue() == category.products_str() + "\n"
+    assert buffer.getvalue().splitlines()[0] == "Товар 0, 500.0 руб. Остаток: 1 шт."
@@ -0,0 +1,43 @@
+import threading
+
+from src.moduls import Category, Product
+from src.registry import CatalogRegistry, StripedCounter, current_registry, default_registry, use_registry
+
+
+def test_striped_counter_concurrent_adds() -> None:
+    """Одновременные увеличения из разных потоков не теряются"""
+    counter = StripedCounter()
+
+    def worker() -> None:
+        for _ in range(10000):
+            counter.add()
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counter.value == 80000
+
+    counter.set(5)
+    assert counter.value == 5
+
+
+def test_isolated_registry_counts_categories() -> None:
+    before = Category.product_count
+    with use_registry() as registry:
+        Category("Смартфоны", "Описание", [Product("A", "Desc", 10.0, 1), Product("B", "Desc", 20.0, 2)])
+        assert registry.snapshot() == {"category_count": 1, "product_count": 2}
+        assert Category.category_count == 1
+    assert current_registry() is default_registry
+    assert Category.product_count == before
+
+
+def test_class_counters_can_be_reset() -> None:
+    registry = CatalogRegistry()
+    with use_registry(registry):
+        category = Category("Категория", "Описание", [Product("A", "Desc", 10.0, 1)])
+        Category.product_count = 0
+        category.add_product(Product("B", "Desc", 20.0, 2))
+        assert category.product_count == 1
+    assert registry.product_count == 1
@@ -0,0 +1,65 @@
+import pytest
+
+from src.moduls import Category, Product
+from src.render_cache import RenderCache
+
+
+@pytest.fixture
+def cache(monkeypatch: pytest.MonkeyPatch) -> RenderCache:
+    cache = RenderCache(maxsize=8)
+    monkeypatch.setattr(Category, "render_cache", cache)
+    return cache
+
+
+def test_lru_eviction_and_stats() -> None:
+    cache = RenderCache(maxsize=2)
+    assert cache.get_or_render("a", 0, lambda: "A") == "A"
+    assert cache.get_or_render("b", 0, lambda: "B") == "B"
+    assert cache.get_or_render("a", 0, lambda: "X") == "A"
+    cache.get_or_render("c", 0, lambda: "C")  # вытесняет b
+    assert cache.get_or_render("b", 0, lambda: "B2") == "B2"
+    assert cache.stats() == {"hits": 1, "misses": 4, "size": 2, "maxsize": 2}
+
+
+def test_category_output_cached_until_change(cache: RenderCache) -> None:
+    product = Product("Iphone 15", "512GB", 210000.0, 8)
+    category = Category("Смартфоны", "Описание", [product])
+
+    assert str(category) == "Смартфоны, количество продуктов: 8 шт."
+    assert str(category) == "Смартфоны, количество продуктов: 8 шт."
+    assert cache.hits == 1
+
+    product.quantity = 5
+    assert str(category) == "Смартфоны, количество продуктов: 5 шт."
+    assert category.products_str() == "Iphone 15, 210000.0 руб. Остаток: 5 шт."
+
+    category.add_product(Product("Xiaomi", "1024GB", 31000.0, 14))
+    assert category.products_str().splitlines()[1] == "Xiaomi, 31000.0 руб. Остаток: 14 шт."
+    assert cache.stats()["misses"] == 4
+
+
+def test_product_str_invalidated_on_price_change() -> None:
+    product = Product("Iphone 15", "512GB", 210000.0, 8)
+    assert str(product) == "Iphone 15, 210000.0 руб. Остаток: 8 шт."
+    product.price = 199000.0
+    assert str(product) == "Iphone 15, 199000.0 руб. Остаток: 8 шт."
+    assert str(Product.from_records([("A", "D", 1.0, 2)])[0]) == "A, 1.0 руб. Остаток: 2 шт."
+
+
+def test_category_named_products_keeps_separate_entries(cache: RenderCache) -> None:
+    """Ключи __str__ и products_str не совпадают даже для категории с названием products"""
+    category = Category("products", "Описание", [Product("Iphone 15", "512GB", 210000.0, 8)])
+    assert category.products_str() == "Iphone 15, 210000.0 руб. Остаток: 8 шт."
+    assert str(category) == "products, количество продуктов: 8 шт."
+
+
+def test_category_keeps_one_entry_per_rendering(cache: RenderCache) -> None:
+    """Новая версия категории заменяет строку прежней версии, а не копит устаревшие"""
+    product = Product("Iphone 15", "512GB", 210000.0, 50)
+    category = Category("Смартфоны", "Описание", [product])
+    for quantity in range(49, 0, -1):
+        product.quantity = quantity
+        category.products_str()
+        str(category)
+    assert cache.stats()["size"] == 2
+    assert category.products_str() == "Iphone 15, 210000.0 руб. Остаток: 1 шт."
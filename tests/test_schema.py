@@ -0,0 +1,110 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from src import data_loader
+from src.data_loader import load_catalog
+from src.moduls import LawnGrass, Product, Smartphone
+from src.registry import use_registry
+from src.schema import SCHEMAS
+
+PHONE = {
+    "type": "smartphone",
+    "name": "Iphone 15",
+    "description": "512GB",
+    "price": 210000.0,
+    "quantity": 8,
+    "efficiency": 98.2,
+    "model": "15",
+    "memory": 512,
+    "color": "Gray space",
+}
+GRASS = {
+    "type": "lawn_grass",
+    "name": "Газон",
+    "description": "Элитная трава",
+    "price": 500,
+    "quantity": 20,
+    "country": "Россия",
+    "germination_period": "7 дней",
+    "color": "Зеленый",
+}
+PLAIN = {"name": "Xiaomi", "description": "1024GB", "price": 31000.0, "quantity": 14}
+
+
+def write_catalog(tmp_path: Path, data: object) -> str:
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+
+def test_load_catalog_dispatches_on_type(tmp_path: Path) -> None:
+    path = write_catalog(tmp_path, [{"name": "Товары", "description": "Описание", "products": [PHONE, GRASS, PLAIN]}])
+    with use_registry():
+        categories, report = load_catalog(path)
+    products = categories[0].products
+    assert [type(p) for p in products] == [Smartphone, LawnGrass, Product]
+    assert products[0].memory == 512 and products[1].country == "Россия"
+    assert report.loaded == 3 and report.errors == []
+
+
+@pytest.mark.parametrize(
+    "record, message",
+    [
+        ({**PLAIN, "price": "дорого"}, "поле price"),
+        ({**PLAIN, "quantity": True}, "поле quantity"),
+        ({**PLAIN, "quantity": 0}, "поле quantity"),
+        ({**PLAIN, "price": -1}, "поле price"),
+        ({k: v for k, v in PHONE.items() if k != "memory"}, "нет поля memory"),
+        ({**PLAIN, "type": "tablet"}, "неизвестный тип"),
+        ({**PLAIN, "type": ["smartphone"]}, "неизвестный тип"),
+        ([1, 2, 3], "объектом"),
+    ],
+)
+def test_load_catalog_reports_bad_records(tmp_path: Path, record: object, message: str) -> None:
+    """Некорректная запись попадает в отчёт, остальные продукты загружаются"""
+    path = write_catalog(tmp_path, [{"name": "Товары", "description": "", "products": [PLAIN, record, PHONE]}])
+    with use_registry():
+        categories, report = load_catalog(path)
+    assert [p.name for p in categories[0].products] == ["Xiaomi", "Iphone 15"]
+    assert report.loaded == 2 and report.rejected == 1
+    assert report.errors[0]["category"] == 0 and report.errors[0]["product"] == 1
+    assert message in report.errors[0]["error"]
+
+
+def test_load_catalog_keeps_validator_errors(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """TypeError из проверки записи не выдаётся за неизвестный тип"""
+
+    def broken(record: dict) -> tuple:
+        raise TypeError("сбой проверки")
+
+    monkeypatch.setitem(data_loader._VALIDATORS, None, (Product, broken))
+    path = write_catalog(tmp_path, [{"name": "Товары", "products": [PLAIN]}])
+    with use_registry():
+        _, report = load_catalog(path)
+    assert report.errors[0]["error"] == "сбой проверки"
+
+
+def test_load_catalog_skips_malformed_category(tmp_path: Path) -> None:
+    path = write_catalog(tmp_path, [{"description": "без названия"}, {"name": "Товары", "products": [PLAIN]}])
+    with use_registry():
+        categories, report = load_catalog(path)
+    assert [c.name for c in categories] == ["Товары"]
+    assert report.errors == [{"category": 0, "product": None, "error": "категория: нет поля name"}]
+
+
+def test_compiled_schema_returns_fields_in_order() -> None:
+    assert SCHEMAS[Product](PLAIN) == ("Xiaomi", "1024GB", 31000.0, 14)
+
+
+def test_load_catalog_allows_sold_out_on_request(tmp_path: Path) -> None:
+    records = [dict(PLAIN, quantity=0), dict(PHONE, quantity=-1)]
+    path = write_catalog(tmp_path, [{"name": "Товары", "products": records}])
+    with use_registry():
+        assert load_catalog(path)[1].loaded == 0
+        categories, report = load_catalog(path, allow_sold_out=True)
+    assert [(p.name, p.quantity) for p in categories[0].products] == [("Xiaomi", 0)]
+    assert report.errors == [
+        {"category": 0, "product": 1, "error": "поле quantity: количество не может быть отрицательным"}
+    ]
@@ -0,0 +1,130 @@
+import asyncio
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict
+from urllib.parse import quote_plus
+
+from src.moduls import Category, Order, Product
+from src.orders import OrderEngine
+from src.service import AsyncOrderQueue, CatalogService, async_load_categories
+
+
+def test_async_load_categories(tmp_path: Path) -> None:
+    path = tmp_path / "catalog.json"
+    data = [{"name": "Смартфоны", "description": "Описание", "products": []}]
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+    categories = asyncio.run(async_load_categories(str(path)))
+    assert [c.name for c in categories] == ["Смартфоны"]
+
+
+def test_async_order_queue_serializes_stock() -> None:
+    product = Product("Iphone 15", "512GB", 100.0, 10)
+
+    async def run() -> list:
+        queue = AsyncOrderQueue()
+        return await asyncio.gather(*(queue.submit(product, 3) for _ in range(5)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert sum(1 for r in results if isinstance(r, ValueError)) == 2
+    assert product.quantity == 1
+
+
+def test_hot_product_uses_one_worker_thread() -> None:
+    """Всплеск заказов на один товар держит в потоках не больше одного заказа и не задерживает другие товары"""
+    hot = Product("Iphone 15", "512GB", 100.0, 100)
+    other = Product("Чехол", "Силикон", 10.0, 5)
+    engine = OrderEngine()
+    running: Dict[str, int] = {"Iphone 15": 0, "Чехол": 0}
+    peak = dict(running)
+    lock = threading.Lock()
+
+    def place_order(product: Product, quantity: int) -> Order:
+        with lock:
+            running[product.name] += 1
+            peak[product.name] = max(peak[product.name], running[product.name])
+        time.sleep(0.005)
+        with lock:
+            running[product.name] -= 1
+        return OrderEngine.place_order(engine, product, quantity)
+
+    engine.place_order = place_order  # type: ignore[method-assign]
+    queue = AsyncOrderQueue(engine)
+
+    async def run() -> int:
+        burst = [asyncio.create_task(queue.submit(hot, 1)) for _ in range(20)]
+        await asyncio.sleep(0)
+        await queue.submit(other, 1)
+        done = sum(task.done() for task in burst)
+        await asyncio.gather(*burst)
+        return done
+
+    done = asyncio.run(run())
+    assert peak == {"Iphone 15": 1, "Чехол": 1}
+    assert done < 20  # заказ другого товара не ждёт всю очередь горячего
+    assert hot.quantity == 80 and other.quantity == 4
+    assert queue._locks == {}
+
+
+def test_catalog_service_http() -> None:
+    product = Product("Iphone 15", "512GB", 100.0, 5)
+    service = CatalogService([Category("Смартфоны", "Описание", [product])])
+
+    async def request(host: str, port: int, method: str, path: str, body: str = "") -> tuple:
+        reader, writer = await asyncio.open_connection(host, port)
+        data = body.encode("utf-8")
+        writer.write(
+            f"{method} {path} HTTP/1.1\r\nConnection: close\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data
+        )
+        response = await reader.read()
+        writer.close()
+        head, _, payload = response.partition(b"\r\n\r\n")
+        return head.split(b" ", 2)[1].decode(), json.loads(payload)
+
+    async def run() -> list:
+        host, port = await service.start()
+        try:
+            order = json.dumps({"category": "Смартфоны", "product": "Iphone 15", "quantity": 2})
+            too_many = json.dumps({"category": "Смартфоны", "product": "Iphone 15", "quantity": 10})
+            return [
+                await request(host, port, "GET", "/categories"),
+                await request(host, port, "POST", "/orders", order),
+                await request(host, port, "POST", "/orders", too_many),
+                await request(host, port, "GET", "/products?category=" + quote_plus("Смартфоны")),
+                await request(host, port, "GET", "/unknown"),
+            ]
+        finally:
+            await service.stop()
+
+    categories, created, conflict, products, missing = asyncio.run(run())
+    assert categories == (
+        "200",
+        [{"name": "Смартфоны", "description": "Описание", "products": 1, "total_quantity": 5, "middle_price": 100.0}],
+    )
+    assert created == ("201", {"product": "Iphone 15", "quantity": 2, "total_price": 200.0})
+    assert conflict[0] == "409"
+    assert products == ("200", [{"name": "Iphone 15", "price": 100.0, "quantity": 3}])
+    assert missing[0] == "404"
+
+
+def test_catalog_service_rejects_malformed_orders() -> None:
+    """Некорректный запрос — 400, неизвестный товар — 404, нехватка остатка — 409"""
+    product = Product("Iphone 15", "512GB", 100.0, 5)
+    service = CatalogService([Category("Смартфоны", "Описание", [product])])
+
+    def order(body: object) -> str:
+        data = body if isinstance(body, bytes) else json.dumps(body).encode("utf-8")
+        return asyncio.run(service.dispatch("POST", "/orders", data))[0]
+
+    assert order(b"{not json") == "400 Bad Request"
+    assert order([1, 2]) == "400 Bad Request"
+    assert order({"category": "Смартфоны", "product": "Iphone 15"}) == "400 Bad Request"
+    assert order({"category": "Смартфоны", "product": "Iphone 15", "quantity": "два"}) == "400 Bad Request"
+    assert order({"category": "Смартфоны", "product": ["Iphone 15"], "quantity": 1}) == "400 Bad Request"
+    assert order({"category": "Смартфоны", "product": "Iphone 15", "quantity": 0}) == "400 Bad Request"
+    assert order({"category": "Смартфоны", "product": "Iphone 15", "quantity": -2}) == "400 Bad Request"
+    assert order({"category": "Смартфоны", "product": "Pixel", "quantity": 1}) == "404 Not Found"
+    assert order({"category": "Смартфоны", "product": "Iphone 15", "quantity": 9}) == "409 Conflict"
+    assert product.quantity == 5
@@ -0,0 +1,75 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
+import pytest
+
+from src.moduls import Category, Product, Smartphone
+from src.registry import use_registry
+from src.shared_cache import CatalogCache, CatalogPublisher
+
+
+@pytest.fixture
+def name() -> str:
+    return f"catalog_test_{os.getpid()}"
+
+
+def make_categories(price: float) -> List[Category]:
+    with use_registry():
+        return [
+            Category(
+                "Смартфоны",
+                "Описание",
+                [
+                    Smartphone("Iphone 15", "512GB", price, 8, 98.2, "15", 512, "Gray"),
+                    Product("Чехол", "Силикон", 1500.0, 3),
+                ],
+            ),
+            Category("Пустая", "Без товаров"),
+        ]
+
+
+def read_in_worker(name: str) -> Tuple[int, List[Tuple[str, float]]]:
+    with CatalogCache(name) as cache:
+        return cache.generation, [(p.name, p.price) for c in cache.categories() for p in c.products]
+
+
+def test_reader_sees_published_catalog_and_refreshes(name: str) -> None:
+    with CatalogPublisher(name) as publisher:
+        assert publisher.publish(make_categories(210000.0)) == 1
+        with use_registry(), CatalogCache(name) as cache:
+            phones, empty = cache.categories()
+            assert phones.quantity == 2 and phones.total_price == 211500.0
+            assert [type(p) for p in phones.products] == [Smartphone, Product]
+            assert empty.products == []
+            assert cache.refresh() is False
+
+            publisher.publish(make_categories(1000.0))
+            assert cache.refresh() is True and cache.generation == 2
+            assert cache.categories()[0].products[0].price == 1000.0
+            assert phones.products[0].price == 210000.0  # старое поколение остаётся согласованным
+
+
+def test_snapshot_size_travels_with_its_block(name: str) -> None:
+    """Размер снимка читается из блока поколения, поэтому каталоги разного размера не путаются"""
+    with use_registry():
+        big = [Category("Большая", "Описание", [Product(f"Товар {i}", "D", 10.0, 1) for i in range(100)])]
+    with CatalogPublisher(name) as publisher:
+        publisher.publish(big)
+        with use_registry(), CatalogCache(name) as cache:
+            assert cache.categories()[0].quantity == 100
+            publisher.publish(make_categories(700.0))
+            assert cache.refresh() is True
+            assert [c.name for c in cache.categories()] == ["Смартфоны", "Пустая"]
+            assert cache.categories()[0].products[1].name == "Чехол"
+
+
+def test_worker_process_attaches_without_loading(name: str) -> None:
+    with CatalogPublisher(name) as publisher:
+        publisher.publish(make_categories(500.0))
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            generation, products = pool.submit(read_in_worker, name).result()
+            assert generation == 1 and products == [("Iphone 15", 500.0), ("Чехол", 1500.0)]
+            publisher.publish(make_categories(600.0))
+            # процесс-читатель завершился, но блок издателя не удалён трекером ресурсов
+            assert pool.submit(read_in_worker, name).result()[0] == 2
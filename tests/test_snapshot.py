@@ -0,0 +1,63 @@
+from pathlib import Path
+
+import pytest
+
+from src.moduls import Category, CategoryIterator, LawnGrass, Product, Smartphone
+from src.registry import use_registry
+from src.snapshot import SnapshotReader, load_snapshot, snapshot_bytes, write_snapshot
+
+
+@pytest.fixture
+def categories() -> list:
+    phones = Category(
+        "Смартфоны",
+        "Описание",
+        [
+            Smartphone("Iphone 15", "512GB", 210000.0, 8, 98.2, "15", 512, "Gray"),
+            Product("Чехол", "512GB", 1500.0, 3),
+            Smartphone("Xiaomi", "1024GB", 31000.0, 14, 90.3, "Note 11", 1024, "Синий"),
+        ],
+    )
+    grass = Category("Газон", "Трава", [LawnGrass("Газон", "Трава", 500.0, 20, "Россия", "7 дней", "Зеленый")])
+    phones.products[1].quantity = 0  # распроданный товар тоже должен сохраняться
+    return [phones, grass, Category("Пустая", "Без товаров")]
+
+
+def test_snapshot_round_trip(tmp_path: Path, categories: list) -> None:
+    path = tmp_path / "catalog.snap"
+    write_snapshot(categories, str(path))
+
+    with use_registry() as registry:
+        loaded = load_snapshot(str(path))
+        assert registry.snapshot() == {"category_count": 3, "product_count": 4}
+
+    for original, restored in zip(categories, loaded):
+        assert restored.name == original.name
+        assert restored.description == original.description
+        assert str(restored) == str(original)
+        assert restored.middle_price() == original.middle_price()
+        assert [repr(p) for p in CategoryIterator(restored)] == [repr(p) for p in original.products]
+
+
+def test_snapshot_products_are_lazy(categories: list) -> None:
+    """Продукты не создаются, пока к ним не обратились"""
+    reader = SnapshotReader(snapshot_bytes(categories))
+    created = []
+    original = reader.products
+    reader.products = lambda first, count: created.append(count) or original(first, count)  # type: ignore
+
+    with use_registry():
+        phones = reader.categories()[0]
+    assert str(phones) == "Смартфоны, количество продуктов: 22 шт."
+    assert created == []
+
+    assert [p.name for p in phones.cheapest(1)] == ["Чехол"]
+    phones.add_product(Product("Плёнка", "Стекло", 300.0, 5))
+    assert created == [3]
+    assert len(phones.products) == 4
+    assert list(reader.prices) == [210000.0, 1500.0, 31000.0, 500.0]
+
+
+def test_snapshot_rejects_foreign_data() -> None:
+    with pytest.raises(ValueError):
+        SnapshotReader(b"NOTASNAP" + bytes(40))